@@ -23,9 +23,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("SECRET_KEY")
 
+# Production boot mode, see entrypoint.sh: no admin, persistent DB connections, warm-up before serving requests
+GEO_API_PRODUCTION = os.getenv("GEO_API_PRODUCTION", "False") == "True"
+
 DEBUG = os.getenv("DEBUG") == "True"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host]
+
+GEO_API_ADMIN = os.getenv("GEO_API_ADMIN", str(not GEO_API_PRODUCTION)) == "True"
 
 
 LOCAL_APPS = ["geo_api"]
@@ -33,7 +38,7 @@ LOCAL_APPS = ["geo_api"]
 THIRD_PARTY_APPS = ["rest_framework", "rest_framework_gis", "drf_yasg"]
 
 DJANGO_APPS = [
-    "django.contrib.admin",
+    *(["django.contrib.admin"] if GEO_API_ADMIN else []),
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -45,7 +50,12 @@ DJANGO_APPS = [
 INSTALLED_APPS = DJANGO_APPS + LOCAL_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    "geo_api.routers.ReadReplicaMiddleware",
+    "geo_api.query_plan.QueryPlanGuardMiddleware",
+    "geo_api.profiling.ProfilingMiddleware",
+    "geo_api.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,9 +96,25 @@ DATABASES = {
         "USER": os.environ.get("DB_USER", "postgres"),
         "PASSWORD": os.environ.get("DB_PASSWORD", "postgres"),
         "NAME": os.environ.get("DB_NAME", "postgres"),
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60" if GEO_API_PRODUCTION else "0")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Read replicas as a comma separated list of "host[:port]", see geo_api/routers.py.
+# Replicas share credentials and the name of the database with the primary.
+for number, replica in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    host, _, port = replica.strip().partition(":")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        # Tests run against the primary only
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["geo_api.routers.ReadReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -126,7 +152,85 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Collected by entrypoint.sh in production mode and served by WhiteNoise, gunicorn doesn't serve static files
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Request profiling, see geo_api/profiling.py
+
+GEO_API_PROFILING = os.getenv("GEO_API_PROFILING", "True") == "True"
+
+GEO_API_SERVER_TIMING = os.getenv("GEO_API_SERVER_TIMING", "True") == "True"
+
+GEO_API_PROFILE_SAMPLE_RATE = float(os.getenv("GEO_API_PROFILE_SAMPLE_RATE", "0"))
+
+GEO_API_SLOW_REQUEST_MS = float(os.getenv("GEO_API_SLOW_REQUEST_MS", "1000"))
+
+GEO_API_PROFILE_DIR = os.getenv("GEO_API_PROFILE_DIR", BASE_DIR / "profiles")
+
+# Response compression, see geo_api/compression.py
+
+GEO_API_COMPRESSION = os.getenv("GEO_API_COMPRESSION", "True") == "True"
+
+GEO_API_COMPRESSION_MIN_BYTES = int(os.getenv("GEO_API_COMPRESSION_MIN_BYTES", "1024"))
+
+GEO_API_COMPRESSION_LEVELS = {"zstd": 3, "br": 5, "gzip": 6}
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "geo_api.renderers.GeoJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Precomputed point/polygon intersections, see geo_api/membership.py
+
+GEO_API_MEMBERSHIP_INDEX = os.getenv("GEO_API_MEMBERSHIP_INDEX", "False") == "True"
+
+# Repair invalid geometries with make_valid instead of rejecting them, see geo_api/geometry.py
+
+GEO_API_REPAIR_GEOMETRY = os.getenv("GEO_API_REPAIR_GEOMETRY", "False") == "True"
+
+# Read replica routing, see geo_api/routers.py
+
+GEO_API_READ_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+
+# Seconds a client reads from the primary after a write, covering the replication lag
+GEO_API_REPLICA_STICKINESS = float(os.getenv("GEO_API_REPLICA_STICKINESS", "5"))
+
+# Runtime query plan checks, see geo_api/query_plan.py: "off", "log" or "raise"
+
+GEO_API_QUERY_GUARD = os.getenv("GEO_API_QUERY_GUARD", "off")
+
+# Async mode of the intersection and join endpoints, see geo_api/jobs.py
+
+GEO_API_JOB_TIMEOUT = float(os.getenv("GEO_API_JOB_TIMEOUT", "300"))
+
+GEO_API_JOB_WORKERS = int(os.getenv("GEO_API_JOB_WORKERS", "2"))
+
+GEO_API_JOB_POLL_INTERVAL = float(os.getenv("GEO_API_JOB_POLL_INTERVAL", "1"))
+
+# A waiting request occupies a web worker, longer waits are left to the client polling the job
+GEO_API_JOB_MAX_WAIT = float(os.getenv("GEO_API_JOB_MAX_WAIT", "2"))
+
+# Seconds finished jobs and their results are kept, 7 days by default
+GEO_API_JOB_RETENTION = float(os.getenv("GEO_API_JOB_RETENTION", "604800"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "geo_api": {
+            "handlers": ["console"],
+            "level": os.getenv("GEO_API_LOG_LEVEL", "INFO"),
+        },
+    },
+}
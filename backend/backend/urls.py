@@ -1,25 +1,50 @@
-from django.contrib import admin
-from django.urls import path, include, re_path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API Documentation",
-        default_version="v1",
-        description="PostGIS REST API",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="adam.harmasz@o2.pl"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+from functools import cache
+
+from django.conf import settings
+from django.urls import path, include
+from django.views.decorators.csrf import csrf_exempt
+
+from geo_api.api_views.metrics import metrics
+
+
+@cache
+def get_swagger_view(ui=None):
+    # drf_yasg and the schema generator are imported on the first request to the documentation, not on boot
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+    from rest_framework import permissions
+
+    schema_view = get_schema_view(
+        openapi.Info(
+            title="API Documentation",
+            default_version="v1",
+            description="PostGIS REST API",
+            terms_of_service="https://www.google.com/policies/terms/",
+            contact=openapi.Contact(email="adam.harmasz@o2.pl"),
+            license=openapi.License(name="BSD License"),
+        ),
+        public=True,
+        permission_classes=[permissions.AllowAny],
+    )
+    return schema_view.with_ui(ui, cache_timeout=0) if ui else schema_view.without_ui(cache_timeout=0)
+
+
+def lazy_swagger_view(ui=None):
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return get_swagger_view(ui)(request, *args, **kwargs)
+
+    return view
+
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/", include("geo_api.urls")),
-    path("swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"),
-    path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
+    path("metrics", metrics, name="metrics"),
+    path("swagger<format>/", lazy_swagger_view(), name="schema-json"),
+    path("swagger/", lazy_swagger_view("swagger"), name="schema-swagger-ui"),
 ]
+
+if settings.GEO_API_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
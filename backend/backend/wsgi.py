@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.GEO_API_PRODUCTION:
+    from geo_api.warmup import warm_up  # noqa: E402
+
+    # Database connections are opened by every worker after fork, see gunicorn.conf.py
+    warm_up(connect=False)
@@ -0,0 +1,13 @@
+#!/bin/sh
+# Boot of the web service. With GEO_API_PRODUCTION=True only pending migrations are applied and static files
+# collected before gunicorn starts, otherwise migrations are generated and the test suite runs before the development server.
+set -e
+if [ "$GEO_API_PRODUCTION" = "True" ]; then
+    python manage.py migrate --noinput
+    python manage.py collectstatic --noinput
+    exec gunicorn backend.wsgi --config gunicorn.conf.py
+fi
+python manage.py makemigrations
+python manage.py migrate --noinput
+python manage.py test
+exec python manage.py runserver 0.0.0.0:8000
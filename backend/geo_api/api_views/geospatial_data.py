@@ -1,14 +1,12 @@
-import json
-
-from django.contrib.gis.db.models import Union
-from django.contrib.gis.geos import GEOSGeometry
-from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from geo_api.models import DBPoint, DBLineString, DBPolygon
+from geo_api import operations
+from geo_api.api_views.jobs import enqueue_job, is_async
+from geo_api.filters import InBBoxFilter, SpatialOrderingFilter
+from geo_api.models import DBPoint, DBLineString, DBPolygon, GeoJob
 from geo_api.serializers.geospatial_data import (
     PointSerializer,
     LineStringSerializer,
@@ -23,9 +21,14 @@ class PointListCreateAPIView(generics.ListCreateAPIView):
     API view to retrieve a list of points or create a new point.
     This view provides GET and POST methods for listing all point objects
     or creating a new point object.
+    Supports filtering by bounding box with `?in_bbox=min_x,min_y,max_x,max_y`
+    and spatial ordering with `?order=geohash`.
     """
     queryset = DBPoint.objects.all()
     serializer_class = PointSerializer
+    # Writes include maintenance of the membership index
+    query_budget = 4
+    filter_backends = [InBBoxFilter, SpatialOrderingFilter]
 
 
 class PointRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -36,6 +39,8 @@ class PointRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     """
     queryset = DBPoint.objects.all()
     serializer_class = PointSerializer
+    # Writes include maintenance of the membership index
+    query_budget = 4
 
 
 class LineStringListCreateAPIView(generics.ListCreateAPIView):
@@ -43,9 +48,13 @@ class LineStringListCreateAPIView(generics.ListCreateAPIView):
     API view to retrieve a list of LineStrings or create a new one.
     This view provides GET and POST methods for listing all LineString objects
     or creating a new LineString object.
+    Supports filtering by bounding box with `?in_bbox=min_x,min_y,max_x,max_y`
+    and spatial ordering with `?order=geohash`.
     """
     queryset = DBLineString.objects.all()
     serializer_class = LineStringSerializer
+    query_budget = 2
+    filter_backends = [InBBoxFilter, SpatialOrderingFilter]
 
 
 class LineStringRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -56,6 +65,7 @@ class LineStringRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVi
     """
     queryset = DBLineString.objects.all()
     serializer_class = LineStringSerializer
+    query_budget = 2
 
 
 class PolygonListCreateAPIView(generics.ListCreateAPIView):
@@ -63,9 +73,14 @@ class PolygonListCreateAPIView(generics.ListCreateAPIView):
     API view to retrieve a list of Polygon objects or create a new one.
     This view provides GET and POST methods for listing all Polygon objects
     or creating a new Polygon object.
+    Supports filtering by bounding box with `?in_bbox=min_x,min_y,max_x,max_y`
+    and spatial ordering with `?order=geohash`.
     """
     queryset = DBPolygon.objects.all()
     serializer_class = PolygonSerializer
+    # Writes include maintenance of the membership index
+    query_budget = 4
+    filter_backends = [InBBoxFilter, SpatialOrderingFilter]
 
 
 class PolygonRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -76,6 +91,8 @@ class PolygonRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
     """
     queryset = DBPolygon.objects.all()
     serializer_class = PolygonSerializer
+    # Writes include maintenance of the membership index
+    query_budget = 4
 
 
 class PolygonIntersectionApiView(APIView):
@@ -87,15 +104,20 @@ class PolygonIntersectionApiView(APIView):
     """
 
     allowed_methods = ["post"]
+    query_budget = 2
+    # Only reads, see geo_api.routers
+    use_replica = True
 
     def post(self, request, pk, format="json"):
         """
         Handles POST request to find if any of given points are intersecting Polygon.
 
         Expects a JSON object with 'points' key containing list of Polygon IDs.
+        With `?async=true` the intersection is queued as a job, see JobRetrieveAPIView.
 
         Returns:
             - 200 OK: list of intersecting Points in GeoJSON format.
+            - 202 Accepted: In async mode, with the URL of the job.
             - 400 Bad Request: If input is invalid.
             - 404 Not Found: If no Points are found or polygon is not found.
         """
@@ -104,26 +126,21 @@ class PolygonIntersectionApiView(APIView):
 
         if not serializer.is_valid():
             return Response({"error": "No proper line ids have been provided!"}, status=status.HTTP_400_BAD_REQUEST)
-        with transaction.atomic():
-            points = DBPoint.objects.filter(id__in=serializer.validated_data["points"])
-            if not points.exists():
-                return Response({"error": "No Points found for provided IDs"}, status=status.HTTP_404_NOT_FOUND)
-
-            intersecting_points = self._find_intersections(points, polygon)
-            serializer = PointSerializer(intersecting_points, many=True)
-
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        point_ids = serializer.validated_data["points"]
+        if is_async(request):
+            return enqueue_job(
+                request, GeoJob.Operation.POLYGON_INTERSECTION, {"polygon": polygon.pk, "points": point_ids}
+            )
+
+        try:
+            data = operations.polygon_intersection(polygon, point_ids)
+        except operations.OperationError as error:
+            return Response({"error": str(error)}, status=error.status_code)
+        return Response(data, status=status.HTTP_200_OK)
 
     def get_serializer(self, *args, **kwargs):
         return PontIdsSerializer(*args, **kwargs)
 
-    def _find_intersections(self, points, polygon):
-        """
-        Find points that intersects with the specified polygon.
-        This method iterates through the provided points and checks if their locations intersect with the given polygon.
-        """
-        return [point for point in points.iterator() if point.location.intersects(polygon.polygon)]
-
 
 class JoinLinesAPIView(APIView):
     """
@@ -135,15 +152,20 @@ class JoinLinesAPIView(APIView):
     """
 
     allowed_methods = ["post"]
+    query_budget = 1
+    # Only reads, see geo_api.routers
+    use_replica = True
 
     def post(self, request, format="json"):
         """
         Handles POST request to merge LineString geometries.
 
         Expects a JSON object with 'lines' key containing list of LineString IDs.
+        With `?async=true` the merge is queued as a job, see JobRetrieveAPIView.
 
         Returns:
             - 200 OK: Merged LineStrings in GeoJSON format.
+            - 202 Accepted: In async mode, with the URL of the job.
             - 400 Bad Request: If input is invalid.
             - 404 Not Found: If no LineStrings are found for provided IDs.
         """
@@ -151,17 +173,15 @@ class JoinLinesAPIView(APIView):
 
         if not serializer.is_valid():
             return Response({"error": "No proper line ids have been provided!"}, status=status.HTTP_400_BAD_REQUEST)
-
-        with transaction.atomic():
-            line_strings = DBLineString.objects.filter(id__in=serializer.validated_data["lines"])
-            if not line_strings.exists():
-                return Response({"error": "No LineStrings found for provided IDs"}, status=status.HTTP_404_NOT_FOUND)
-
-            combined_geometry = line_strings.aggregate(union=Union("line"))["union"]
-            merged_line = combined_geometry.merged
-            geojson_result = json.loads(GEOSGeometry(merged_line.wkt).geojson)
-
-            return Response(geojson_result, status=status.HTTP_200_OK)
+        line_ids = serializer.validated_data["lines"]
+        if is_async(request):
+            return enqueue_job(request, GeoJob.Operation.JOIN_LINES, {"lines": line_ids})
+
+        try:
+            geojson_result = operations.join_lines(line_ids)
+        except operations.OperationError as error:
+            return Response({"error": str(error)}, status=error.status_code)
+        return Response(geojson_result, status=status.HTTP_200_OK)
 
     def get_serializer(self, *args, **kwargs):
         return LineStringIdsSerializer(*args, **kwargs)
@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from rest_framework import generics, status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from geo_api import jobs
+from geo_api.models import GeoJob
+from geo_api.serializers.jobs import GeoJobSerializer
+
+WAIT_POLL_INTERVAL = 0.25
+
+
+def is_async(request):
+    return request.query_params.get("async", "").lower() in ("1", "true")
+
+
+def enqueue_job(request, operation, payload):
+    """
+    Queue an operation and return 202 Accepted pointing at the job.
+    """
+    job = jobs.enqueue(operation, payload)
+    url = reverse("job-detail", kwargs={"pk": job.pk}, request=request)
+    return Response(
+        {"job_id": job.pk, "status": job.status, "url": url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": url},
+    )
+
+
+class JobWaitMixin:
+    """
+    Long polling: with `?wait=<seconds>` the job is fetched until it finishes or the time runs out.
+    The wait is capped by GEO_API_JOB_MAX_WAIT.
+    """
+
+    queryset = GeoJob.objects.all()
+    # Long polling queries the job repeatedly
+    query_budget = None
+    max_query_repeats = None
+    # Status of a job changes while it's polled, replicas may lag behind
+    use_replica = False
+
+    def get_object(self):
+        try:
+            wait = min(float(self.request.query_params.get("wait", 0)), settings.GEO_API_JOB_MAX_WAIT)
+        except ValueError:
+            raise ParseError("'wait' has to be a number of seconds.")
+        deadline = time.monotonic() + wait
+        job = super().get_object()
+        while not job.finished and time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_INTERVAL)
+            job.refresh_from_db()
+        return job
+
+
+class JobRetrieveAPIView(JobWaitMixin, generics.RetrieveAPIView):
+    """
+    API view to retrieve the status of a job queued by the async mode of the intersection or join endpoints.
+    """
+
+    serializer_class = GeoJobSerializer
+
+
+class JobResultAPIView(JobWaitMixin, generics.GenericAPIView):
+    """
+    API view to retrieve the result of a job.
+
+    Returns:
+        - 202 Accepted: If the job hasn't finished yet.
+        - The response the synchronous endpoint would return otherwise.
+    """
+
+    def get(self, request, pk, format="json"):
+        job = self.get_object()
+        if not job.finished:
+            return Response({"job_id": job.pk, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+        return Response(job.result, status=job.status_code)
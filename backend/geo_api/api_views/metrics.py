@@ -0,0 +1,12 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from geo_api.profiling import registry
+
+
+@require_GET
+def metrics(request):
+    """
+    Expose request profiling metrics of this worker process in the Prometheus text format.
+    """
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class GeoApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "geo_api"
+
+    def ready(self):
+        # Connects signal receivers maintaining the point/polygon membership table
+        from geo_api import membership  # noqa: F401
+
+        # Registers the `__any` lookup
+        from geo_api import lookups  # noqa: F401
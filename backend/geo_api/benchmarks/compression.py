@@ -0,0 +1,45 @@
+import gzip
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LIST_ENDPOINTS = ("point-list-create", "linestring-list-create", "polygon-list-create")
+
+# Levels typically used for on-the-fly compression of HTTP responses
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def compressed_sizes(content):
+    sizes = {"raw": len(content), "gzip": len(gzip.compress(content, compresslevel=GZIP_LEVEL))}
+    if brotli is not None:
+        sizes["brotli"] = len(brotli.compress(content, quality=BROTLI_QUALITY))
+    return sizes
+
+
+def measure_order_compression(orders=("id", "geohash")):
+    """
+    Compare compressed sizes of the list endpoints returned in each of `orders`.
+    The reduction is relative to the first order, e.g. 0.2 means the response is 20% smaller.
+    """
+    client = APIClient()
+    results = {}
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for name in LIST_ENDPOINTS:
+            url = reverse(name)
+            sizes = {order: compressed_sizes(client.get(url, {"order": order}).content) for order in orders}
+            baseline = sizes[orders[0]]
+            for order in orders[1:]:
+                sizes[order]["reduction"] = {
+                    encoding: 1 - sizes[order][encoding] / baseline[encoding]
+                    for encoding in baseline
+                    if encoding != "raw"
+                }
+            results[name] = sizes
+    return results
@@ -0,0 +1,113 @@
+import math
+import random
+from itertools import islice
+
+from django.contrib.gis.geos import Point, LineString, Polygon
+
+from geo_api.geometry import geometry_field, normalize_many
+from geo_api.models import DBPoint, DBLineString, DBPolygon, DEFAULT_SRID
+
+# min_x, min_y, max_x, max_y of the area covered by generated data (roughly Central Europe)
+DEFAULT_BBOX = (10.0, 45.0, 25.0, 55.0)
+
+
+def generate_points(count, seed=0, bbox=DEFAULT_BBOX):
+    """
+    Yield `count` DBPoint objects scattered over `bbox`.
+    The same seed always produces the same sequence of points.
+    """
+    rng = random.Random(seed)
+    min_x, min_y, max_x, max_y = bbox
+    for _ in range(count):
+        yield DBPoint(location=Point(rng.uniform(min_x, max_x), rng.uniform(min_y, max_y), srid=DEFAULT_SRID))
+
+
+def generate_road_network(count, seed=0, bbox=DEFAULT_BBOX, vertices_per_segment=5):
+    """
+    Yield `count` DBLineString objects forming a road-like network.
+
+    Roads run along a jittered grid alternating between horizontal and vertical streets.
+    Every street is split into segments sharing their end vertices, so consecutive
+    segments of the same street can be merged back into a single LineString.
+    """
+    rng = random.Random(seed)
+    min_x, min_y, max_x, max_y = bbox
+    streets = max(2, math.ceil(math.sqrt(count)))
+    segments_per_street = math.ceil(count / streets)
+    step_x = (max_x - min_x) / (segments_per_street * (vertices_per_segment - 1))
+    step_y = (max_y - min_y) / (segments_per_street * (vertices_per_segment - 1))
+    jitter = min(step_x, step_y) / 4
+
+    produced = 0
+    for street in range(streets):
+        horizontal = street % 2 == 0
+        offset = (street // 2 + 0.5) / math.ceil(streets / 2)
+        previous = None
+        for segment in range(segments_per_street):
+            if produced == count:
+                return
+            vertices = [previous] if previous else []
+            first_vertex = segment * (vertices_per_segment - 1) + (1 if previous else 0)
+            for index in range(first_vertex, (segment + 1) * (vertices_per_segment - 1) + 1):
+                if horizontal:
+                    x = min_x + index * step_x
+                    y = min_y + offset * (max_y - min_y) + rng.uniform(-jitter, jitter)
+                else:
+                    x = min_x + offset * (max_x - min_x) + rng.uniform(-jitter, jitter)
+                    y = min_y + index * step_y
+                vertices.append((x, y))
+            previous = vertices[-1]
+            produced += 1
+            yield DBLineString(name=f"Road {street}/{segment}", line=LineString(vertices, srid=DEFAULT_SRID))
+
+
+def generate_polygon_tiling(count, seed=0, bbox=DEFAULT_BBOX):
+    """
+    Yield `count` DBPolygon objects tiling `bbox` with a grid of slightly irregular quadrilaterals.
+    Neighbouring tiles share their corners so the tiling has no gaps or overlaps.
+    """
+    rng = random.Random(seed)
+    min_x, min_y, max_x, max_y = bbox
+    columns = max(1, math.ceil(math.sqrt(count)))
+    rows = math.ceil(count / columns)
+    step_x = (max_x - min_x) / columns
+    step_y = (max_y - min_y) / rows
+    jitter = min(step_x, step_y) / 4
+
+    corners = {}
+    for row in range(rows + 1):
+        for column in range(columns + 1):
+            inner = 0 < row < rows and 0 < column < columns
+            dx = rng.uniform(-jitter, jitter) if inner else 0.0
+            dy = rng.uniform(-jitter, jitter) if inner else 0.0
+            corners[row, column] = (min_x + column * step_x + dx, min_y + row * step_y + dy)
+
+    for index in range(count):
+        row, column = divmod(index, columns)
+        ring = [
+            corners[row, column],
+            corners[row, column + 1],
+            corners[row + 1, column + 1],
+            corners[row + 1, column],
+            corners[row, column],
+        ]
+        yield DBPolygon(name=f"Tile {row}/{column}", polygon=Polygon(ring, srid=DEFAULT_SRID))
+
+
+def bulk_insert(model, objects, batch_size=10_000, normalize=False):
+    """
+    Insert objects produced by a generator in batches so millions of rows never sit in memory at once.
+    With `normalize` geometries of every batch are normalized in a single query before they are inserted.
+    Returns the number of inserted rows.
+    """
+    inserted = 0
+    objects = iter(objects)
+    field = geometry_field(model)
+    while batch := list(islice(objects, batch_size)):
+        if normalize:
+            geometries = normalize_many([getattr(obj, field.name) for obj in batch], field.geom_type)
+            for obj, geometry in zip(batch, geometries):
+                setattr(obj, field.name, geometry)
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        inserted += len(batch)
+    return inserted
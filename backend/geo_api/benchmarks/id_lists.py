@@ -0,0 +1,57 @@
+import time
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from geo_api.benchmarks.runner import summarize
+from geo_api.models import DBPoint
+
+ID_LIST_SIZES = (10, 10_000, 1_000_000)
+
+
+def build_ids(existing_ids, size):
+    """
+    `size` ids starting with existing rows, padded with ids past the last row when there are not enough of them.
+    """
+    ids = list(existing_ids[:size])
+    first_missing = existing_ids[-1] + 1 if existing_ids else 1
+    return ids + list(range(first_missing, first_missing + size - len(ids)))
+
+
+def timed_calls(function, iterations):
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+
+def measure_id_lists(dataset, sizes=ID_LIST_SIZES, iterations=3):
+    """
+    For every size of the id list compare the `IN (...)` and `= ANY(array)` bindings of the point lookup,
+    and measure the intersection and join endpoints end to end.
+    """
+    client = APIClient()
+    polygon_id = dataset.polygon_ids[len(dataset.polygon_ids) // 2]
+    intersection_url = reverse("polygon-intersection", args=[polygon_id])
+    join_url = reverse("join-lines")
+    results = {}
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for size in sizes:
+            point_ids = build_ids(dataset.point_ids, size)
+            line_ids = build_ids(dataset.line_ids, size)
+            results[str(size)] = {
+                "in": timed_calls(lambda: list(DBPoint.objects.filter(id__in=point_ids).values_list("id")), iterations),
+                "any": timed_calls(
+                    lambda: list(DBPoint.objects.filter(id__any=point_ids).values_list("id")), iterations
+                ),
+                "polygon-intersection": timed_calls(
+                    lambda: client.post(intersection_url, {"points": point_ids}, format="json"), iterations
+                ),
+                "join-lines": timed_calls(
+                    lambda: client.post(join_url, {"lines": line_ids}, format="json"), iterations
+                ),
+            }
+    return results
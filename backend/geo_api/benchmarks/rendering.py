@@ -0,0 +1,59 @@
+import time
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from geo_api.benchmarks.compression import LIST_ENDPOINTS
+from geo_api.compression import available_compressors
+from geo_api.renderers import GeoJSONRenderer
+
+RENDERERS = {"stdlib-json": JSONRenderer, "orjson": GeoJSONRenderer}
+
+
+def cpu_seconds(function, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        result = function()
+    return (time.process_time() - started) / repeat, result
+
+
+def measure_rendering(levels, repeat=3):
+    """
+    For every list endpoint measure CPU seconds per MB of output of each renderer,
+    and wire size plus CPU seconds per input MB of each compression encoding.
+    """
+    client = APIClient()
+    results = {}
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for name in LIST_ENDPOINTS:
+            data = client.get(reverse(name)).data
+            endpoint = {"renderers": {}, "encodings": {}}
+            for renderer_name, renderer_class in RENDERERS.items():
+                renderer = renderer_class()
+                cpu, content = cpu_seconds(lambda: renderer.render(data, "application/json"), repeat)
+                megabytes = len(content) / 1_000_000
+                endpoint["renderers"][renderer_name] = {
+                    "bytes": len(content),
+                    "cpu_seconds": cpu,
+                    "cpu_seconds_per_mb": cpu / megabytes if megabytes else None,
+                }
+
+            # Encodings compress the output of the last renderer, the one used in production
+            megabytes = len(content) / 1_000_000
+            for compressor_class in available_compressors():
+                level = levels[compressor_class.encoding]
+
+                def compress():
+                    compressor = compressor_class(level)
+                    return compressor.compress(content) + compressor.finish()
+
+                cpu, compressed = cpu_seconds(compress, repeat)
+                endpoint["encodings"][compressor_class.encoding] = {
+                    "bytes": len(compressed),
+                    "ratio": len(compressed) / len(content) if content else None,
+                    "cpu_seconds_per_mb": cpu / megabytes if megabytes else None,
+                }
+            results[name] = endpoint
+    return results
@@ -0,0 +1,194 @@
+import json
+import platform
+import random
+import resource
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import django
+from django.db.models import Max
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from geo_api.benchmarks.generators import (
+    bulk_insert,
+    generate_points,
+    generate_polygon_tiling,
+    generate_road_network,
+)
+from geo_api.models import DBPoint, DBLineString, DBPolygon
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class Scenario:
+    """A single request which is replayed against one endpoint."""
+
+    name: str
+    method: str
+    url: str
+    data: dict = None
+
+
+@dataclass
+class Dataset:
+    """Ids of the rows inserted by `generate_dataset`, used to build requests hitting real data."""
+
+    point_ids: range
+    line_ids: range
+    polygon_ids: range
+
+
+def generate_dataset(points, lines, polygons, seed=0, batch_size=10_000):
+    """
+    Insert synthetic points, roads and polygon tiles and return the ids of the inserted rows.
+    """
+    ranges = []
+    for model, generator, count in (
+        (DBPoint, generate_points, points),
+        (DBLineString, generate_road_network, lines),
+        (DBPolygon, generate_polygon_tiling, polygons),
+    ):
+        first_id = (model.objects.aggregate(max_id=Max("id"))["max_id"] or 0) + 1
+        bulk_insert(model, generator(count, seed=seed), batch_size=batch_size)
+        last_id = model.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        ranges.append(range(first_id, last_id + 1))
+    return Dataset(*ranges)
+
+
+def build_scenarios(dataset, ids_per_request=100, seed=0):
+    """
+    Build one scenario for every endpoint exposed by geo_api/urls.py.
+    """
+    rng = random.Random(seed)
+    point_sample = rng.sample(dataset.point_ids, min(ids_per_request, len(dataset.point_ids)))
+    # Consecutive road segments belong to the same street so they merge into a single LineString
+    line_sample = list(dataset.line_ids[:ids_per_request])
+    polygon_id = dataset.polygon_ids[len(dataset.polygon_ids) // 2]
+
+    return [
+        Scenario("point-list", "get", reverse("point-list-create")),
+        Scenario("point-detail", "get", reverse("point-detail", args=[dataset.point_ids[0]])),
+        Scenario("linestring-list", "get", reverse("linestring-list-create")),
+        Scenario("linestring-detail", "get", reverse("linestring-detail", args=[dataset.line_ids[0]])),
+        Scenario("polygon-list", "get", reverse("polygon-list-create")),
+        Scenario("polygon-detail", "get", reverse("polygon-detail", args=[polygon_id])),
+        Scenario(
+            "polygon-intersection",
+            "post",
+            reverse("polygon-intersection", args=[polygon_id]),
+            {"points": point_sample},
+        ),
+        Scenario("join-lines", "post", reverse("join-lines"), {"lines": line_sample}),
+    ]
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies):
+    """
+    Turn a list of request durations (in seconds) into latency percentiles (in milliseconds) and throughput.
+    """
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    summary = {f"p{p}_ms": percentile(ordered, p) * 1000 for p in PERCENTILES}
+    summary.update(
+        {
+            "min_ms": ordered[0] * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "mean_ms": total / len(ordered) * 1000,
+            "requests_per_second": len(ordered) / total if total else None,
+        }
+    )
+    return summary
+
+
+def _send(client, scenario):
+    if scenario.method == "get":
+        return client.get(scenario.url)
+    return client.post(scenario.url, scenario.data, format="json")
+
+
+def measure(client, scenario, iterations, warmup=1):
+    """
+    Replay a scenario and collect latency, throughput, response size and peak memory allocated by the request.
+    """
+    for _ in range(warmup):
+        _send(client, scenario)
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = _send(client, scenario)
+        latencies.append(time.perf_counter() - started)
+
+    # Memory is traced in a separate request, tracing would distort the latencies above
+    tracemalloc.start()
+    _send(client, scenario)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "method": scenario.method.upper(),
+        "url": scenario.url,
+        "status_code": response.status_code,
+        "response_bytes": len(response.content),
+        "iterations": iterations,
+        "peak_memory_bytes": peak,
+    }
+    result.update(summarize(latencies))
+    return result
+
+
+def run_benchmark(dataset, iterations=20, warmup=1, ids_per_request=100, seed=0, only=None):
+    """
+    Measure every scenario and return JSON-serializable results.
+    """
+    client = APIClient()
+    results = {}
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for scenario in build_scenarios(dataset, ids_per_request=ids_per_request, seed=seed):
+            if only and scenario.name not in only:
+                continue
+            results[scenario.name] = measure(client, scenario, iterations, warmup=warmup)
+    return results
+
+
+def environment_info():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def compare(current, baseline, metric="p95_ms"):
+    """
+    Return the relative change of `metric` for every scenario present in both result sets.
+    """
+    changes = {}
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous and previous.get(metric):
+            changes[name] = (result[metric] - previous[metric]) / previous[metric]
+    return changes
+
+
+def dump(report, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
@@ -0,0 +1,96 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+# Lines of `python -X importtime`, nesting of imports is shown by two spaces per level
+IMPORTTIME_RE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\| ( *)(\S+)\s*$")
+
+# Boot of a worker in a fresh interpreter, prints seconds spent in every phase as JSON
+BOOT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter() - started
+from geo_api.warmup import warm_up
+print(json.dumps({"setup": setup, **warm_up(connect=False)}))
+"""
+
+MODES = {"development": "False", "production": "True"}
+
+
+def parse_importtime(output):
+    """
+    Return {module: {"self_us", "cumulative_us", "depth"}} parsed from the output of `python -X importtime`.
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            modules[match.group(4)] = {
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            }
+    return modules
+
+
+def import_time_by_package(modules):
+    """
+    Sum import times of modules by their top level package, e.g. django, rest_framework or drf_yasg.
+    """
+    packages = defaultdict(int)
+    for name, module in modules.items():
+        packages[name.split(".")[0]] += module["self_us"]
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def boot(production):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"),
+        "GEO_API_PRODUCTION": MODES["production" if production else "development"],
+    }
+    # GEO_API_ADMIN set for this process would override the default of the mode
+    env.pop("GEO_API_ADMIN", None)
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - started, json.loads(process.stdout.splitlines()[-1]), process.stderr
+
+
+def measure_startup(modes=tuple(MODES), repeat=3, top=20):
+    """
+    Boot a fresh interpreter `repeat` times for every mode and report wall time, time of the boot phases
+    and import time of every module. The first, unmeasured boot compiles bytecode.
+    """
+    results = {}
+    for mode in modes:
+        production = mode == "production"
+        boot(production)
+        runs = [boot(production) for _ in range(repeat)]
+        modules = parse_importtime(runs[-1][2])
+        slowest = sorted(modules.items(), key=lambda item: item[1]["cumulative_us"], reverse=True)[:top]
+        results[mode] = {
+            "wall_seconds": statistics.median(wall for wall, _, _ in runs),
+            "phases_seconds": {
+                phase: statistics.median(phases[phase] for _, phases, _ in runs) for phase in runs[-1][1]
+            },
+            "imported_modules": len(modules),
+            "import_us_by_package": import_time_by_package(modules),
+            "slowest_imports": dict(slowest),
+        }
+    return results
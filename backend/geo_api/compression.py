@@ -0,0 +1,192 @@
+"""
+Response compression negotiated with `Accept-Encoding`.
+
+Supports zstd, brotli and gzip, preferred in this order when the client accepts more of them.
+zstd and brotli are used only when their packages are installed. Streaming responses (e.g. static
+files) are compressed chunk by chunk. DRF responses, the GeoJSON lists included, are rendered in memory
+as a whole and compressed in one call.
+"""
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ACCEPT_ENCODING_RE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$")
+
+# Uncompressed bytes of a streaming response after which the compressed data is flushed to the client
+STREAM_FLUSH_BYTES = 64 * 1024
+
+
+class GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self, level):
+        # wbits=31 produces the gzip container instead of the raw zlib one
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    encoding = "zstd"
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_compressors():
+    """
+    Return compressors usable in this environment, in order of preference.
+    """
+    compressors = []
+    if zstandard is not None:
+        compressors.append(ZstdCompressor)
+    if brotli is not None:
+        compressors.append(BrotliCompressor)
+    compressors.append(GzipCompressor)
+    return compressors
+
+
+def parse_accept_encoding(header):
+    """
+    Return a {encoding: quality} mapping of an `Accept-Encoding` header.
+    """
+    accepted = {}
+    for part in header.split(","):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            accepted[match.group(1).lower()] = float(match.group(2) or 1)
+        except ValueError:
+            continue
+    return accepted
+
+
+def negotiate(header):
+    """
+    Return the preferred compressor class accepted by the client, or None.
+    """
+    accepted = parse_accept_encoding(header)
+    candidates = [
+        compressor
+        for compressor in available_compressors()
+        if accepted.get(compressor.encoding, accepted.get("*", 0)) > 0
+    ]
+    if not candidates:
+        return None
+    # max() returns the first of equally accepted encodings, i.e. the one preferred by the server
+    return max(candidates, key=lambda compressor: accepted.get(compressor.encoding, accepted.get("*", 0)))
+
+
+def compress_stream(compressor, chunks, flush_bytes=STREAM_FLUSH_BYTES):
+    """
+    Compress streamed `chunks`, flushing only once `flush_bytes` were fed since the last flush.
+    Every flush ends a compressed block, flushing small chunks one by one would ruin the ratio.
+    """
+    pending = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_bytes:
+            data += compressor.flush()
+            pending = 0
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding accepted by the client.
+    Only complete 200 responses are compressed: partial content (`Content-Range` describes uncompressed
+    bytes) and responses marked `Cache-Control: no-transform` are passed through.
+
+    Settings:
+        - GEO_API_COMPRESSION: enables the middleware.
+        - GEO_API_COMPRESSION_MIN_BYTES: smaller responses are sent uncompressed.
+        - GEO_API_COMPRESSION_LEVELS: compression level of every encoding.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not settings.GEO_API_COMPRESSION or response.has_header("Content-Encoding"):
+            return response
+        if response.status_code != 200 or response.has_header("Content-Range"):
+            return response
+        if "no-transform" in response.get("Cache-Control", "").lower():
+            return response
+        if not response.streaming and len(response.content) < settings.GEO_API_COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressor_class = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if compressor_class is None:
+            return response
+        compressor = compressor_class(settings.GEO_API_COMPRESSION_LEVELS[compressor_class.encoding])
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            response.streaming_content = compress_stream(compressor, response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # Compressed and uncompressed representations mustn't share a strong ETag
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = compressor.encoding
+        return response
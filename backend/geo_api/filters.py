@@ -0,0 +1,98 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import GeoHash
+from django.contrib.gis.geos import Polygon
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import ParseError
+from rest_framework.filters import BaseFilterBackend
+
+from geo_api.geohash import GEOHASH_PRECISION, covering_ranges, in_range
+from geo_api.models import DEFAULT_SRID
+
+
+def get_geo_field(view):
+    return view.get_serializer_class().Meta.geo_field
+
+
+def geohash_expression(model, field_name):
+    """
+    GeoHash of a geometry (of the centre of its bounding box for non-point geometries).
+    Models storing it in a `geohash` column (DBPoint) are indexed and partitioned by that column,
+    others by the expression, which has to match the indexes exactly for them to be used.
+    """
+    try:
+        model._meta.get_field("geohash")
+    except FieldDoesNotExist:
+        return GeoHash(field_name, precision=GEOHASH_PRECISION)
+    return F("geohash")
+
+
+class InBBoxFilter(BaseFilterBackend):
+    """
+    Filter features intersecting a bounding box passed as `?in_bbox=min_x,min_y,max_x,max_y`.
+
+    The geometry field is the `geo_field` of the serializer of the view.
+    Points are additionally restricted to the GeoHash ranges covering the bounding box,
+    which lets PostgreSQL use the GeoHash BRIN index and prune partitions of a partitioned table.
+    """
+
+    bbox_param = "in_bbox"
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.bbox_param)
+        if value is None:
+            return queryset
+
+        try:
+            bbox = tuple(float(coordinate) for coordinate in value.split(","))
+        except ValueError:
+            bbox = ()
+        if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            raise ParseError(f"'{self.bbox_param}' has to be formatted as min_x,min_y,max_x,max_y.")
+        if not in_range(*bbox):
+            raise ParseError(f"'{self.bbox_param}' has to lie within longitude -180..180 and latitude -90..90.")
+
+        field_name = get_geo_field(view)
+        polygon = Polygon.from_bbox(bbox)
+        polygon.srid = DEFAULT_SRID
+        queryset = queryset.filter(**{f"{field_name}__intersects": polygon})
+
+        if isinstance(queryset.model._meta.get_field(field_name), PointField):
+            queryset = self._filter_geohash_ranges(queryset, field_name, bbox)
+        return queryset
+
+    def _filter_geohash_ranges(self, queryset, field_name, bbox):
+        ranges = covering_ranges(bbox)
+        if len(ranges) == 1 and ranges[0][0] in ("", "0") and ranges[0][1] is None:
+            # The bbox covers the whole curve
+            return queryset
+        conditions = [
+            Q(geohash_key__gte=start, geohash_key__lt=end) if end else Q(geohash_key__gte=start)
+            for start, end in ranges
+        ]
+        queryset = queryset.alias(geohash_key=geohash_expression(queryset.model, field_name))
+        return queryset.filter(reduce(or_, conditions))
+
+
+class SpatialOrderingFilter(BaseFilterBackend):
+    """
+    Order features along the GeoHash space-filling curve with `?order=geohash`, so that features lying
+    close to each other are returned close to each other. Without the parameter features are ordered by id.
+
+    The order is backed by a B-tree index on the GeoHash expression of every model.
+    """
+
+    order_param = "order"
+    orders = ("id", "geohash")
+
+    def filter_queryset(self, request, queryset, view):
+        order = request.query_params.get(self.order_param, "id")
+        if order not in self.orders:
+            raise ParseError(f"'{self.order_param}' has to be one of: {', '.join(self.orders)}.")
+        if order == "geohash":
+            geohash_key = geohash_expression(queryset.model, get_geo_field(view))
+            return queryset.alias(geohash_key=geohash_key).order_by("geohash_key", "id")
+        return queryset.order_by("id")
@@ -0,0 +1,115 @@
+"""
+GeoHash helpers used to turn bounding boxes into ranges of the GeoHash space-filling curve.
+
+GeoHashes sharing a prefix lie in the same cell, so a bounding box can be translated into
+a handful of `prefix <= geohash < next_prefix` conditions. Such conditions let PostgreSQL use
+BRIN indexes and prune partitions created by the `tune_point_storage` command.
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Number of characters of the GeoHash keys computed by the database
+GEOHASH_PRECISION = 12
+
+
+def in_range(min_x, min_y, max_x, max_y):
+    """
+    Whether a bounding box lies within longitude -180..180 and latitude -90..90, the domain of GeoHash.
+    PostGIS ST_GeoHash fails on geometries outside of it, NaN and infinite values are rejected as well.
+    """
+    return all(math.isfinite(value) for value in (min_x, min_y, max_x, max_y)) and (
+        -180 <= min_x and max_x <= 180 and -90 <= min_y and max_y <= 90
+    )
+
+
+def _bit_counts(precision):
+    # Bits alternate between longitude and latitude, starting with longitude
+    bits = 5 * precision
+    return (bits + 1) // 2, bits // 2
+
+
+def _encode_cell(x, y, precision):
+    lon_bits, lat_bits = _bit_counts(precision)
+    value = 0
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            lon_bits -= 1
+            value = value << 1 | (x >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            value = value << 1 | (y >> lat_bits) & 1
+    return "".join(BASE32[value >> 5 * (precision - 1 - index) & 31] for index in range(precision))
+
+
+def _cell_index(coordinate, low, high, bits):
+    """
+    Index of the cell of `coordinate` among 2**bits cells of [low, high].
+    Halves the interval the way PostGIS ST_GeoHash does, so keys computed here and by the database are equal.
+    """
+    index = 0
+    for _ in range(bits):
+        mid = (low + high) / 2
+        if coordinate >= mid:
+            index = index << 1 | 1
+            low = mid
+        else:
+            index <<= 1
+            high = mid
+    return index
+
+
+def encode(lon, lat, precision=GEOHASH_PRECISION):
+    """
+    Return the GeoHash of a point, equal to PostGIS `ST_GeoHash(point, precision)`.
+    """
+    lon_bits, lat_bits = _bit_counts(precision)
+    return _encode_cell(_cell_index(lon, -180, 180, lon_bits), _cell_index(lat, -90, 90, lat_bits), precision)
+
+
+def covering_prefixes(bbox, max_cells=32):
+    """
+    Return sorted GeoHash prefixes of the cells covering `bbox` (min_x, min_y, max_x, max_y).
+    The longest prefixes for which no more than `max_cells` cells are needed are used.
+    """
+    min_x, min_y, max_x, max_y = bbox
+    best = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        lon_bits, lat_bits = _bit_counts(precision)
+        columns = range(_cell_index(min_x, -180, 180, lon_bits), _cell_index(max_x, -180, 180, lon_bits) + 1)
+        rows = range(_cell_index(min_y, -90, 90, lat_bits), _cell_index(max_y, -90, 90, lat_bits) + 1)
+        if len(columns) * len(rows) > max_cells:
+            break
+        best = (precision, columns, rows)
+    if best is None:
+        # Even single character cells are too many, the whole curve has to be scanned
+        return [""]
+    precision, columns, rows = best
+    return sorted(_encode_cell(x, y, precision) for x in columns for y in rows)
+
+
+def next_prefix(prefix):
+    """
+    Return the smallest prefix greater than every GeoHash starting with `prefix`,
+    or None when there is no such prefix.
+    """
+    prefix = prefix.rstrip(BASE32[-1])
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def covering_ranges(bbox, max_cells=32):
+    """
+    Return `(start, end)` GeoHash ranges covering `bbox`, adjacent cells are merged into a single range.
+    `end` is exclusive and None when the range reaches the end of the curve.
+    """
+    ranges = []
+    for prefix in covering_prefixes(bbox, max_cells=max_cells):
+        start, end = prefix, next_prefix(prefix)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
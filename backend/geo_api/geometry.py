@@ -0,0 +1,150 @@
+"""
+Validation and normalization of geometries on write.
+
+Every stored geometry is:
+    - reprojected to DEFAULT_SRID (geometries without SRID are assumed to be in it) and within the range
+      of longitude and latitude,
+    - stripped of consecutive duplicate vertices,
+    - valid, invalid geometries are rejected or, with GEO_API_REPAIR_GEOMETRY, repaired by make_valid
+      as long as the repaired geometry has the type of the model field.
+
+`normalize` handles a single geometry with GEOS, `normalize_many` a batch of them in a single set-based
+statement evaluated by PostGIS, which is what bulk loads and the `repair_geometries` command use.
+"""
+
+from django.conf import settings
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import GEOSException, GEOSGeometry, LineString, Polygon
+from django.db import connection
+from rest_framework import serializers
+
+from geo_api.geohash import in_range
+from geo_api.models import DEFAULT_SRID
+
+
+class GeometryError(ValueError):
+    pass
+
+
+def geometry_field(model):
+    return next(field for field in model._meta.concrete_fields if isinstance(field, GeometryField))
+
+
+def _without_duplicates(coords):
+    unique = [coords[0]]
+    for coordinate in coords[1:]:
+        if coordinate != unique[-1]:
+            unique.append(coordinate)
+    return unique
+
+
+def remove_repeated_points(geometry):
+    if isinstance(geometry, Polygon):
+        rings = [_without_duplicates(ring.coords) for ring in geometry]
+        return Polygon(*rings, srid=geometry.srid)
+    if isinstance(geometry, LineString):
+        return LineString(_without_duplicates(geometry.coords), srid=geometry.srid)
+    return geometry
+
+
+def check_range(geometry):
+    """
+    Reject coordinates outside of longitude -180..180 and latitude -90..90, they would fail the GeoHash indexes.
+    """
+    if not geometry.empty and not in_range(*geometry.extent):
+        raise GeometryError("Coordinates have to lie within longitude -180..180 and latitude -90..90.")
+
+
+def _should_repair(repair):
+    return settings.GEO_API_REPAIR_GEOMETRY if repair is None else repair
+
+
+def normalize(geometry, geom_type, repair=None):
+    """
+    Return the normalized copy of `geometry`, `geom_type` is the type stored by the model field, e.g. "POLYGON".
+    Raises GeometryError when the geometry is invalid and can't (or mustn't) be repaired.
+    """
+    geometry = geometry.clone()
+    if geometry.srid is None:
+        geometry.srid = DEFAULT_SRID
+    elif geometry.srid != DEFAULT_SRID:
+        geometry.transform(DEFAULT_SRID)
+
+    check_range(geometry)
+
+    try:
+        geometry = remove_repeated_points(geometry)
+    except (GEOSException, IndexError, ValueError, TypeError):
+        raise GeometryError("Geometry has too few distinct vertices.")
+
+    if not geometry.valid:
+        if not _should_repair(repair):
+            raise GeometryError(f"Invalid geometry: {geometry.valid_reason}")
+        reason = geometry.valid_reason
+        geometry = geometry.make_valid()
+        if geometry.geom_type.upper() != geom_type.upper():
+            raise GeometryError(f"Invalid geometry ({reason}) can't be repaired into a {geom_type.title()}.")
+    if geometry.geom_type.upper() != geom_type.upper():
+        raise GeometryError(f"Expected a {geom_type.title()}, got a {geometry.geom_type}.")
+    return geometry
+
+
+def normalized_sql(column, repair=True):
+    """
+    SQL expression normalizing the geometry in `column`, the PostGIS counterpart of `normalize`.
+    """
+    geometry = (
+        f"ST_RemoveRepeatedPoints(ST_Transform("
+        f"CASE WHEN ST_SRID({column}) = 0 THEN ST_SetSRID({column}, {DEFAULT_SRID}) ELSE {column} END, "
+        f"{DEFAULT_SRID}))"
+    )
+    # ST_MakeValid returns valid geometries unchanged
+    return f"ST_MakeValid({geometry})" if repair else geometry
+
+
+def normalize_many(geometries, geom_type, repair=None):
+    """
+    Normalize a batch of geometries in one query and return them in the same order.
+    Raises GeometryError naming the position of the first geometry which can't be stored.
+    """
+    if not geometries:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT ST_AsEWKB(normalized.geometry), ST_IsValidReason(normalized.geometry), "
+            f"GeometryType(normalized.geometry) "
+            f"FROM (SELECT position, {normalized_sql('geometry', _should_repair(repair))} AS geometry "
+            f"FROM unnest(%s::geometry[]) WITH ORDINALITY AS input(geometry, position)) normalized "
+            f"ORDER BY normalized.position",
+            [[geometry.hexewkb.decode() for geometry in geometries]],
+        )
+        rows = cursor.fetchall()
+
+    normalized = []
+    for position, (ewkb, reason, normalized_type) in enumerate(rows):
+        if reason != "Valid Geometry":
+            raise GeometryError(f"Invalid geometry at position {position}: {reason}")
+        if normalized_type != geom_type.upper():
+            raise GeometryError(f"Geometry at position {position} can't be stored as a {geom_type.title()}.")
+        geometry = GEOSGeometry(bytes(ewkb))
+        try:
+            check_range(geometry)
+        except GeometryError as error:
+            raise GeometryError(f"Geometry at position {position}: {error}")
+        normalized.append(geometry)
+    return normalized
+
+
+class NormalizedGeometryMixin:
+    """Serializer mixin normalizing the `geo_field` of the serializer before it's saved."""
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        field_name = self.Meta.geo_field
+        if attrs.get(field_name) is not None:
+            geom_type = self.Meta.model._meta.get_field(field_name).geom_type
+            try:
+                attrs[field_name] = normalize(attrs[field_name], geom_type)
+            except GeometryError as error:
+                raise serializers.ValidationError({field_name: [str(error)]})
+        return attrs
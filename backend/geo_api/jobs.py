@@ -0,0 +1,212 @@
+"""
+Database backed queue of spatial operations executed outside the request.
+
+Jobs are GeoJob rows. Workers started by the `run_geo_workers` command claim pending jobs with
+`SELECT ... FOR UPDATE SKIP LOCKED`, so any number of them can share the queue without a message broker.
+Every job runs with a timeout, enforced both by PostgreSQL `statement_timeout` and a timer signal
+interrupting Python code, e.g. merging of a large geometry. A worker survives database outages: it drops its
+connection, fails the job it was running and reconnects on its next poll.
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, close_old_connections, connection, transaction
+from django.utils import timezone
+from psycopg2.errors import QueryCanceled
+from rest_framework import status
+
+from geo_api import operations
+from geo_api.models import DBPolygon, GeoJob
+
+logger = logging.getLogger(__name__)
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _polygon_intersection(payload):
+    polygon = DBPolygon.objects.filter(pk=payload["polygon"]).first()
+    if polygon is None:
+        raise operations.OperationError("No Polygon found for provided ID", status.HTTP_404_NOT_FOUND)
+    return operations.polygon_intersection(polygon, payload["points"])
+
+
+def _join_lines(payload):
+    return operations.join_lines(payload["lines"])
+
+
+OPERATIONS = {
+    GeoJob.Operation.POLYGON_INTERSECTION: _polygon_intersection,
+    GeoJob.Operation.JOIN_LINES: _join_lines,
+}
+
+
+def enqueue(operation, payload, timeout=None):
+    """
+    Store a pending job, `timeout` defaults to GEO_API_JOB_TIMEOUT seconds.
+    """
+    return GeoJob.objects.create(operation=operation, payload=payload, timeout=timeout or settings.GEO_API_JOB_TIMEOUT)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker=None):
+    """
+    Mark the oldest pending job as running and return it, or None when the queue is empty.
+    """
+    with transaction.atomic():
+        job = (
+            GeoJob.objects.select_for_update(skip_locked=True)
+            .filter(status=GeoJob.Status.PENDING)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = GeoJob.Status.RUNNING
+        job.worker = worker or worker_name()
+        job.started_at = timezone.now()
+        job.deadline = job.started_at + timedelta(seconds=job.timeout)
+        job.save(update_fields=["status", "worker", "started_at", "deadline"])
+        return job
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raise JobTimeout when the block runs longer than `seconds`.
+    Signals are delivered to the main thread only, elsewhere the limit is left to the database.
+    """
+    if not hasattr(signal, "setitimer"):
+        yield
+        return
+    try:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    except ValueError:
+        # Not the main thread
+        yield
+        return
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeout()
+
+
+def _finish(job, job_status, result, status_code):
+    job.status = job_status
+    job.result = result
+    job.status_code = status_code
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "status_code", "finished_at"])
+
+
+def _fail(job):
+    _finish(job, GeoJob.Status.FAILED, {"error": "Job failed"}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def execute(job):
+    """
+    Run a claimed job and store its result.
+    Errors of the database connection itself are raised, the job can't be finished on a broken connection.
+    """
+    try:
+        with time_limit(job.timeout), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = %s", [int(job.timeout * 1000)])
+            result = OPERATIONS[job.operation](job.payload)
+    except operations.OperationError as error:
+        _finish(job, GeoJob.Status.FAILED, {"error": str(error)}, error.status_code)
+    except (JobTimeout, OperationalError) as error:
+        # statement_timeout surfaces as OperationalError caused by QueryCanceled, any other one is a lost connection
+        if isinstance(error, OperationalError) and not isinstance(error.__cause__, QueryCanceled):
+            raise
+        logger.warning("Job %s exceeded its timeout of %ss", job.id, job.timeout)
+        _finish(job, GeoJob.Status.FAILED, {"error": "Job timed out"}, status.HTTP_504_GATEWAY_TIMEOUT)
+    except InterfaceError:
+        raise
+    except Exception:
+        logger.exception("Job %s failed", job.id)
+        _fail(job)
+    else:
+        _finish(job, GeoJob.Status.SUCCEEDED, result, status.HTTP_200_OK)
+    return job
+
+
+def fail_expired_jobs():
+    """
+    Fail running jobs past their deadline, i.e. jobs of workers which were killed or couldn't reach the database
+    to finish them. Returns the number of failed jobs.
+    """
+    return GeoJob.objects.filter(status=GeoJob.Status.RUNNING, deadline__lt=timezone.now()).update(
+        status=GeoJob.Status.FAILED,
+        result={"error": "Job timed out"},
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        finished_at=timezone.now(),
+    )
+
+
+def delete_finished_jobs():
+    """
+    Delete succeeded and failed jobs finished more than GEO_API_JOB_RETENTION seconds ago.
+    Returns the number of deleted jobs.
+    """
+    deleted, _ = GeoJob.objects.filter(
+        status__in=[GeoJob.Status.SUCCEEDED, GeoJob.Status.FAILED],
+        finished_at__lt=timezone.now() - timedelta(seconds=settings.GEO_API_JOB_RETENTION),
+    ).delete()
+    return deleted
+
+
+def work(poll_interval=None, burst=False, should_stop=lambda: False):
+    """
+    Process jobs until `should_stop` returns True, or until the queue is empty when `burst` is set.
+    Returns the number of processed jobs.
+
+    Database errors don't stop the worker, it closes its connection, waits `poll_interval` and carries on
+    with a new one. The interrupted job is failed once the database is reachable again.
+    """
+    poll_interval = settings.GEO_API_JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    name = worker_name()
+    processed = 0
+    interrupted = None
+    while not should_stop():
+        job = None
+        try:
+            # Within a transaction (e.g. a test case) the connection can't be replaced
+            if not connection.in_atomic_block:
+                close_old_connections()
+            if interrupted is not None:
+                _fail(interrupted)
+                interrupted = None
+            fail_expired_jobs()
+            delete_finished_jobs()
+            job = claim_next_job(name)
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            execute(job)
+            processed += 1
+        except (DatabaseError, InterfaceError):
+            logger.exception("Worker %s lost its database connection", name)
+            interrupted = job or interrupted
+            connection.close()
+            time.sleep(poll_interval)
+    return processed
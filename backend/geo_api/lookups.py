@@ -0,0 +1,24 @@
+"""
+`field__any=[...]` lookup of integer fields, binding the whole list as a single array literal.
+
+`field__in` renders one placeholder per value, so a statement with a million ids is a million parameters long
+for Django to build and for PostgreSQL to parse. A Python list would not help, psycopg2 renders it as
+`ARRAY[1, 2, ...]`, so the values are joined into one `'{1,2,...}'` text parameter cast to an array instead.
+"""
+
+from django.db.models import IntegerField, Lookup
+
+
+@IntegerField.register_lookup
+class AnyLookup(Lookup):
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return "{" + ",".join(str(int(self.lhs.output_field.get_prep_value(value))) for value in self.rhs) + "}"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        # The cast parses the literal, and types the array when it's empty
+        array_type = self.lhs.output_field.db_type(connection)
+        return f"{lhs} = ANY(%s::{array_type}[])", (*lhs_params, self.rhs)
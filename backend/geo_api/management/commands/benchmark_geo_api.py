@@ -0,0 +1,122 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from geo_api.benchmarks.compression import measure_order_compression
+from geo_api.benchmarks.id_lists import ID_LIST_SIZES, measure_id_lists
+from geo_api.benchmarks.rendering import measure_rendering
+from geo_api.benchmarks.runner import compare, dump, environment_info, generate_dataset, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every geo_api endpoint against deterministic synthetic data. "
+        "Generated rows are rolled back afterwards unless --keep-data is passed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=100_000, help="Number of generated points")
+        parser.add_argument("--lines", type=int, default=10_000, help="Number of generated road segments")
+        parser.add_argument("--polygons", type=int, default=2_500, help="Number of generated polygon tiles")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic data generators")
+        parser.add_argument("--iterations", type=int, default=20, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=1, help="Unmeasured requests per endpoint")
+        parser.add_argument("--ids-per-request", type=int, default=100, help="Ids sent to intersection/join")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows inserted per bulk_create")
+        parser.add_argument("--only", nargs="*", help="Names of scenarios to run, e.g. point-list join-lines")
+        parser.add_argument("--output", type=Path, help="Where to store JSON results")
+        parser.add_argument("--compare", type=Path, help="Previous JSON results to compare p95 latency against")
+        parser.add_argument(
+            "--order-compression",
+            action="store_true",
+            help="Also compare gzip/brotli sizes of the list endpoints ordered by id and by GeoHash",
+        )
+        parser.add_argument(
+            "--rendering",
+            action="store_true",
+            help="Also measure CPU per MB of the JSON renderers and wire size of every compression encoding",
+        )
+        parser.add_argument(
+            "--id-lists",
+            nargs="*",
+            type=int,
+            help=f"Also compare IN and ANY bindings of id lists of these sizes, {ID_LIST_SIZES} when none are given",
+        )
+        parser.add_argument("--keep-data", action="store_true", help="Commit generated rows instead of rolling back")
+
+    def handle(self, *args, **options):
+        if min(options["points"], options["lines"], options["polygons"]) < 1:
+            raise CommandError("At least one point, line and polygon has to be generated.")
+
+        with transaction.atomic():
+            self.stdout.write("Generating synthetic data...")
+            dataset = generate_dataset(
+                options["points"],
+                options["lines"],
+                options["polygons"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write("Running benchmark...")
+            results = run_benchmark(
+                dataset,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                ids_per_request=options["ids_per_request"],
+                seed=options["seed"],
+                only=options["only"],
+            )
+            order_compression = measure_order_compression() if options["order_compression"] else None
+            rendering = measure_rendering(settings.GEO_API_COMPRESSION_LEVELS) if options["rendering"] else None
+            id_lists = None
+            if options["id_lists"] is not None:
+                id_lists = measure_id_lists(dataset, sizes=options["id_lists"] or ID_LIST_SIZES)
+            if not options["keep_data"]:
+                transaction.set_rollback(True)
+
+        report = {
+            "environment": environment_info(),
+            "parameters": {
+                key: options[key]
+                for key in ("points", "lines", "polygons", "seed", "iterations", "warmup", "ids_per_request")
+            },
+            "results": results,
+        }
+        if order_compression:
+            report["order_compression"] = order_compression
+        if rendering:
+            report["rendering"] = rendering
+        if id_lists:
+            report["id_lists"] = id_lists
+        output = options["output"] or (
+            Path(settings.BASE_DIR) / "benchmark_results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        )
+        dump(report, output)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} p50={result['p50_ms']:9.2f}ms p95={result['p95_ms']:9.2f}ms "
+                f"rps={result['requests_per_second']:8.1f} bytes={result['response_bytes']}"
+            )
+        for name, sizes in (order_compression or {}).items():
+            reductions = sizes["geohash"]["reduction"].items()
+            reduction = ", ".join(f"{encoding} {value:+.1%}" for encoding, value in reductions)
+            self.stdout.write(f"{name:<22} size reduction of ?order=geohash: {reduction}")
+        for name, endpoint in (rendering or {}).items():
+            for renderer, result in endpoint["renderers"].items():
+                self.stdout.write(f"{name:<22} {renderer:<12} {result['cpu_seconds_per_mb'] or 0:.4f} CPU s/MB")
+            for encoding, result in endpoint["encodings"].items():
+                self.stdout.write(f"{name:<22} {encoding:<12} {result['bytes']} bytes on the wire")
+        for size, measurements in (id_lists or {}).items():
+            for name, result in measurements.items():
+                self.stdout.write(f"{size:>8} ids {name:<22} p50={result['p50_ms']:9.2f}ms")
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                baseline = json.load(file)
+            for name, change in compare(report, baseline).items():
+                self.stdout.write(f"{name:<22} p95 change: {change:+.1%}")
+        self.stdout.write(self.style.SUCCESS(f"Results stored in {output}"))
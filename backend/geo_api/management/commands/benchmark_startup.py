@@ -0,0 +1,36 @@
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from geo_api.benchmarks.runner import dump, environment_info
+from geo_api.benchmarks.startup import MODES, measure_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start of a worker in development and production boot mode: wall time, "
+        "Django setup and warm-up phases, and import time of every module (python -X importtime)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Boot modes")
+        parser.add_argument("--repeat", type=int, default=3, help="Measured boots per mode")
+        parser.add_argument("--top", type=int, default=20, help="Number of slowest imports to report")
+        parser.add_argument("--output", type=Path, help="Where to store JSON results")
+
+    def handle(self, *args, **options):
+        results = measure_startup(options["modes"], repeat=options["repeat"], top=options["top"])
+        output = options["output"] or (
+            Path(settings.BASE_DIR) / "benchmark_results" / f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+        )
+        dump({"environment": environment_info(), "results": results}, output)
+
+        for mode, result in results.items():
+            phases = ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in result["phases_seconds"].items())
+            self.stdout.write(f"{mode:<12} wall={result['wall_seconds'] * 1000:.1f}ms {phases}")
+            self.stdout.write(f"{'':<12} {result['imported_modules']} modules imported, slowest:")
+            for module, timing in result["slowest_imports"].items():
+                self.stdout.write(f"{'':<12} {timing['cumulative_us'] / 1000:9.2f}ms {module}")
+        self.stdout.write(self.style.SUCCESS(f"Results stored in {output}"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from geo_api import membership
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the point/polygon membership table from scratch, e.g. after bulk loads which bypass "
+        "model signals. The table is rebuilt in a single transaction, readers keep seeing the old content until "
+        "it commits, saves of points and polygons having memberships wait for it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of polygons processed per statement")
+
+    def handle(self, *args, **options):
+        def progress(last_polygon_id, total):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Polygons up to id {last_polygon_id} processed, {total} memberships stored")
+
+        total = membership.rebuild(batch_size=options["batch_size"], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Membership index rebuilt, {total} memberships stored."))
@@ -0,0 +1,111 @@
+import multiprocessing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Max, Min
+
+from geo_api import membership
+from geo_api.geohash import GEOHASH_PRECISION
+from geo_api.geometry import geometry_field, normalized_sql
+from geo_api.models import DBPoint, DBLineString, DBPolygon
+
+MODELS = {"points": DBPoint, "lines": DBLineString, "polygons": DBPolygon}
+
+
+def repair_chunk(model_name, start, end, dry_run=False):
+    """
+    Normalize rows of ids in [start, end) with a single UPDATE.
+    Returns the number of changed rows and of rows which can't be repaired into the type of the column.
+    """
+    model = MODELS[model_name]
+    table = model._meta.db_table
+    field = geometry_field(model)
+    column, geom_type = field.column, field.geom_type
+    normalized = f"SELECT id, {normalized_sql(column)} AS geometry FROM {table} WHERE id >= %s AND id < %s"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FILTER (WHERE NOT ST_IsValid(geometry) OR GeometryType(geometry) <> %s) "
+            f"FROM ({normalized}) normalized",
+            [geom_type, start, end],
+        )
+        unrepairable = cursor.fetchone()[0]
+        # Rows are rewritten only when normalization changes them
+        changed = (
+            f"FROM ({normalized}) normalized WHERE {table}.id = normalized.id "
+            f"AND ST_IsValid(normalized.geometry) AND GeometryType(normalized.geometry) = %s "
+            f"AND ST_AsEWKB({table}.{column}) <> ST_AsEWKB(normalized.geometry)"
+        )
+        if dry_run:
+            cursor.execute(f"SELECT count(*) FROM {table} {changed}", [start, end, geom_type])
+            return cursor.fetchone()[0], unrepairable
+        assignments = f"{column} = normalized.geometry"
+        if model is DBPoint:
+            # The stored GeoHash has to follow the point, ST_GeoHash computes the same key as DBPoint.save()
+            assignments += f", geohash = ST_GeoHash(normalized.geometry, {GEOHASH_PRECISION})"
+        cursor.execute(f"UPDATE {table} SET {assignments} {changed}", [start, end, geom_type])
+        return cursor.rowcount, unrepairable
+
+
+def _repair_chunk(args):
+    try:
+        return repair_chunk(*args)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Validate and normalize stored geometries: repair invalid ones with ST_MakeValid, reproject them to the "
+        "default SRID and strip duplicate vertices. Tables are processed in chunks of ids by parallel workers, "
+        "every chunk is committed separately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--models", nargs="+", choices=list(MODELS), default=list(MODELS), help="Tables to repair, all by default"
+        )
+        parser.add_argument("--chunk-size", type=int, default=10_000, help="Number of ids per UPDATE")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, multiprocessing.cpu_count()),
+            help="Number of worker processes, 1 repairs in this process",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count rows which would be changed")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size and --workers have to be positive.")
+
+        changed_models = []
+        for model_name in options["models"]:
+            bounds = MODELS[model_name].objects.aggregate(first=Min("id"), last=Max("id"))
+            if bounds["first"] is None:
+                continue
+            chunks = [
+                (model_name, start, start + options["chunk_size"], options["dry_run"])
+                for start in range(bounds["first"], bounds["last"] + 1, options["chunk_size"])
+            ]
+            changed, unrepairable = self.run_chunks(chunks, options["workers"])
+
+            verb = "would be changed" if options["dry_run"] else "changed"
+            self.stdout.write(f"{model_name}: {changed} rows {verb}, {unrepairable} can't be repaired")
+            if changed and not options["dry_run"]:
+                changed_models.append(model_name)
+
+        if settings.GEO_API_MEMBERSHIP_INDEX and {"points", "polygons"} & set(changed_models):
+            # Raw updates bypass the signals maintaining the index
+            self.stdout.write("Rebuilding membership index...")
+            membership.rebuild()
+        self.stdout.write(self.style.SUCCESS("Geometries repaired."))
+
+    def run_chunks(self, chunks, workers):
+        if workers == 1:
+            results = [repair_chunk(*chunk) for chunk in chunks]
+        else:
+            # Forked workers mustn't share the connection of this process
+            connections.close_all()
+            with multiprocessing.Pool(workers) as pool:
+                results = list(pool.imap_unordered(_repair_chunk, chunks))
+        return sum(changed for changed, _ in results), sum(unrepairable for _, unrepairable in results)
@@ -0,0 +1,79 @@
+import multiprocessing
+import multiprocessing.connection
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from geo_api import jobs
+
+
+def run_worker(stop_event, poll_interval, burst):
+    # The parent process coordinates shutdown through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        jobs.work(poll_interval=poll_interval, burst=burst, should_stop=stop_event.is_set)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Process jobs of the async mode of the intersection and join endpoints with a pool of worker processes. "
+        "Workers finish their current job on SIGINT/SIGTERM before exiting, workers which crash are restarted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.GEO_API_JOB_WORKERS,
+            help="Number of worker processes, defaults to GEO_API_JOB_WORKERS",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.GEO_API_JOB_POLL_INTERVAL,
+            help="Seconds an idle worker waits before checking the queue again",
+        )
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("At least one worker is required.")
+
+        # Forked workers mustn't share the connection of the parent process
+        connections.close_all()
+        stop_event = multiprocessing.Event()
+
+        def start_worker(number):
+            worker = multiprocessing.Process(
+                target=run_worker,
+                args=(stop_event, options["poll_interval"], options["burst"]),
+                name=f"geo-worker-{number}",
+            )
+            worker.start()
+            return worker
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping workers...")
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        workers = {number: start_worker(number) for number in range(options["concurrency"])}
+        self.stdout.write(f"Started {len(workers)} workers.")
+        while workers:
+            multiprocessing.connection.wait([worker.sentinel for worker in workers.values()])
+            for number, worker in list(workers.items()):
+                if worker.is_alive():
+                    continue
+                del workers[number]
+                # Workers exit with 0 when stopped or when the queue is empty in burst mode
+                if worker.exitcode and not stop_event.is_set():
+                    self.stderr.write(f"{worker.name} exited with code {worker.exitcode}, restarting it.")
+                    workers[number] = start_worker(number)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
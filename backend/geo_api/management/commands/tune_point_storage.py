@@ -0,0 +1,121 @@
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from geo_api.geohash import BASE32, GEOHASH_PRECISION
+from geo_api.models import DBPoint
+
+
+class Command(BaseCommand):
+    help = (
+        "Tune storage of very large DBPoint tables. "
+        "'cluster' rewrites the table in spatial order (GiST or GeoHash curve), which makes the GeoHash BRIN index "
+        "selective. 'partition' converts the table into a table partitioned by GeoHash prefix, bbox queries of "
+        "the points list endpoint are then pruned to the partitions covering the bbox. "
+        "Both operations take an exclusive lock on the table for their whole duration."
+    )
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="operation", required=True)
+
+        cluster = subparsers.add_parser("cluster", help="Physically sort rows in spatial order")
+        cluster.add_argument(
+            "--order",
+            choices=["gist", "geohash"],
+            default="geohash",
+            help="Sort by the GiST index on location or by the GeoHash space-filling curve",
+        )
+
+        partition = subparsers.add_parser("partition", help="Partition the table by GeoHash prefix")
+        partition.add_argument(
+            "--prefix-length",
+            type=int,
+            choices=[1, 2],
+            default=1,
+            help="GeoHash prefix length of a partition, 1 gives 32 partitions and 2 gives 1024",
+        )
+
+        for subparser in (cluster, partition):
+            subparser.add_argument("--dry-run", action="store_true", help="Print SQL without running it")
+
+    def handle(self, *args, **options):
+        table = DBPoint._meta.db_table
+        if options["operation"] == "cluster":
+            statements = self.cluster_statements(table, options["order"])
+        else:
+            if self.is_partitioned(table):
+                raise CommandError(f"Table {table} is already partitioned.")
+            statements = self.partition_statements(table, options["prefix_length"])
+
+        if options["dry_run"]:
+            self.stdout.write(";\n".join(statements) + ";")
+            return
+
+        # CLUSTER of a partitioned table can't run inside a transaction block
+        with transaction.atomic() if options["operation"] == "partition" else nullcontext():
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    self.stdout.write(statement)
+                    cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS(f"{options['operation'].capitalize()} of {table} finished."))
+
+    def is_partitioned(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+            return cursor.fetchone()[0] == "p"
+
+    def gist_index_name(self, table):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        for name, constraint in constraints.items():
+            if constraint["index"] and constraint["type"] == "gist" and constraint["columns"] == ["location"]:
+                return name
+        raise CommandError(f"No GiST index on {table}.location found.")
+
+    def cluster_statements(self, table, order):
+        # CLUSTER needs an index defining an order, the GeoHash BRIN index doesn't, its B-tree counterpart does
+        index = self.gist_index_name(table) if order == "gist" else f"{table}_gh_order"
+        return [f"CLUSTER {table} USING {index}", f"ANALYZE {table}"]
+
+    def partition_statements(self, table, prefix_length):
+        """
+        Replace the table with a copy partitioned by RANGE of the `geohash` column.
+
+        Primary keys of partitioned tables have to contain the partition key, so the primary key becomes
+        (id, geohash). PostgreSQL can't enforce uniqueness of id alone across partitions, ids keep coming
+        from a single sequence. Indexes are recreated under the names Django's migration state expects.
+        """
+        old_table = f"{table}_unpartitioned"
+        sequence = f"{table}_id_seq"
+        prefixes = [""]
+        for _ in range(prefix_length):
+            prefixes = [prefix + char for prefix in prefixes for char in BASE32]
+
+        statements = [
+            f"ALTER TABLE {table} RENAME TO {old_table}",
+            f"CREATE TABLE {table} ("
+            f"id bigint NOT NULL, "
+            f"location geometry(Point, 4326) NOT NULL, "
+            f"geohash varchar({GEOHASH_PRECISION}) NOT NULL"
+            f") PARTITION BY RANGE (geohash)",
+        ]
+        for index, prefix in enumerate(prefixes):
+            upper = f"'{prefixes[index + 1]}'" if index + 1 < len(prefixes) else "MAXVALUE"
+            lower = f"'{prefix}'" if index else "MINVALUE"
+            statements.append(
+                f"CREATE TABLE {table}_{prefix} PARTITION OF {table} FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+        # Names of the old constraints, indexes and identity sequence are free once the old table is dropped
+        statements += [
+            f"INSERT INTO {table} (id, location, geohash) SELECT id, location, geohash FROM {old_table}",
+            f"DROP TABLE {old_table}",
+            f"CREATE SEQUENCE {sequence} OWNED BY {table}.id",
+            f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)",
+            f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')",
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, geohash)",
+        ]
+        schema_editor = connection.schema_editor(collect_sql=True, atomic=False)
+        statements += [str(statement) for statement in schema_editor._model_indexes_sql(DBPoint)]
+        statements.append(f"ANALYZE {table}")
+        return statements
@@ -0,0 +1,83 @@
+"""
+Maintenance of the DBPointPolygonMembership table.
+
+When GEO_API_MEMBERSHIP_INDEX is enabled, saving a point or a polygon recomputes only the memberships
+of that feature, deleting one removes its memberships by cascade. Writes bypassing model signals
+(bulk_create, QuerySet.update, raw SQL) require a rebuild with the `rebuild_membership_index` command.
+
+A point and a polygon saved by concurrent transactions both insert their common pair, the second insert is
+skipped by ON CONFLICT instead of failing the save. Each refresh only sees the other feature as last committed
+though, so a membership of a point and a polygon changed at the same time may be missing or stale until one of
+them is saved again or the table is rebuilt.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from geo_api.models import DBPoint, DBPolygon, DBPointPolygonMembership
+
+
+def _insert_memberships(condition="TRUE", params=None):
+    """
+    Insert memberships of all point/polygon pairs matching `condition`, `p` is the point and `g` the polygon table.
+    The join is evaluated by the GiST indexes in a single statement, pairs already stored are skipped.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {DBPointPolygonMembership._meta.db_table} (point_id, polygon_id) "
+            f"SELECT p.id, g.id FROM {DBPoint._meta.db_table} p "
+            f"JOIN {DBPolygon._meta.db_table} g ON ST_Intersects(p.location, g.polygon) "
+            f"WHERE {condition} "
+            "ON CONFLICT (polygon_id, point_id) DO NOTHING",
+            params,
+        )
+        return cursor.rowcount
+
+
+def refresh_point(point_id):
+    with transaction.atomic():
+        DBPointPolygonMembership.objects.filter(point_id=point_id).delete()
+        _insert_memberships("p.id = %s", [point_id])
+
+
+def refresh_polygon(polygon_id):
+    with transaction.atomic():
+        DBPointPolygonMembership.objects.filter(polygon_id=polygon_id).delete()
+        _insert_memberships("g.id = %s", [polygon_id])
+
+
+def rebuild(batch_size=1000, progress=None):
+    """
+    Recompute the whole table, polygons are processed in batches of `batch_size` ids.
+    Returns the number of stored memberships.
+
+    Old rows are removed by DELETE rather than TRUNCATE, whose exclusive lock would block every reader until
+    the rebuild commits. Readers keep seeing the old rows meanwhile, saves of points and polygons having
+    memberships wait for the rebuild on the row locks of the DELETE.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {DBPointPolygonMembership._meta.db_table}")
+        polygon_ids = DBPolygon.objects.order_by("id").values_list("id", flat=True)
+        total = 0
+        last_id = 0
+        while batch := list(polygon_ids.filter(id__gt=last_id)[:batch_size]):
+            total += _insert_memberships("g.id >= %s AND g.id <= %s", [batch[0], batch[-1]])
+            last_id = batch[-1]
+            if progress:
+                progress(last_id, total)
+        return total
+
+
+@receiver(post_save, sender=DBPoint, dispatch_uid="geo_api_point_membership")
+def point_saved(sender, instance, raw=False, **kwargs):
+    if settings.GEO_API_MEMBERSHIP_INDEX and not raw:
+        refresh_point(instance.pk)
+
+
+@receiver(post_save, sender=DBPolygon, dispatch_uid="geo_api_polygon_membership")
+def polygon_saved(sender, instance, raw=False, **kwargs):
+    if settings.GEO_API_MEMBERSHIP_INDEX and not raw:
+        refresh_polygon(instance.pk)
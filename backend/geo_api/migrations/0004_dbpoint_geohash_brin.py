@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-19 12:00
+
+import django.contrib.gis.db.models.functions
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geo_api", "0003_dbpolygon"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dbpoint",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                django.contrib.gis.db.models.functions.GeoHash("location", precision=12),
+                name="geo_api_dbpoint_geohash_brin",
+            ),
+        ),
+    ]
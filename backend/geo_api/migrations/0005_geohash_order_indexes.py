@@ -0,0 +1,38 @@
+# Generated by Django 5.1 on 2026-10-19 12:00
+
+import django.contrib.gis.db.models.functions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geo_api", "0004_dbpoint_geohash_brin"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dbpoint",
+            index=models.Index(
+                django.contrib.gis.db.models.functions.GeoHash("location", precision=12),
+                models.F("id"),
+                name="geo_api_dbpoint_gh_order",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dblinestring",
+            index=models.Index(
+                django.contrib.gis.db.models.functions.GeoHash("line", precision=12),
+                models.F("id"),
+                name="geo_api_dblinestring_gh_order",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dbpolygon",
+            index=models.Index(
+                django.contrib.gis.db.models.functions.GeoHash("polygon", precision=12),
+                models.F("id"),
+                name="geo_api_dbpolygon_gh_order",
+            ),
+        ),
+    ]
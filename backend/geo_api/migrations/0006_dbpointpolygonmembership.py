@@ -0,0 +1,51 @@
+# Generated by Django 5.1 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geo_api", "0005_geohash_order_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DBPointPolygonMembership",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "point",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="polygon_memberships",
+                        to="geo_api.dbpoint",
+                    ),
+                ),
+                (
+                    "polygon",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="point_memberships",
+                        to="geo_api.dbpolygon",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("polygon", "point"), name="unique_polygon_point_membership")
+                ],
+            },
+        ),
+    ]
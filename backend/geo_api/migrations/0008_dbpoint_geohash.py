@@ -0,0 +1,41 @@
+# Generated by Django 5.1 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geo_api", "0007_geojob"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="dbpoint",
+            name="geo_api_dbpoint_geohash_brin",
+        ),
+        migrations.RemoveIndex(
+            model_name="dbpoint",
+            name="geo_api_dbpoint_gh_order",
+        ),
+        migrations.AddField(
+            model_name="dbpoint",
+            name="geohash",
+            field=models.CharField(default="", editable=False, max_length=12),
+            preserve_default=False,
+        ),
+        # Same key as geo_api.geohash.encode computes on save
+        migrations.RunSQL(
+            "UPDATE geo_api_dbpoint SET geohash = ST_GeoHash(location, 12)",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="dbpoint",
+            index=django.contrib.postgres.indexes.BrinIndex(fields=["geohash"], name="geo_api_dbpoint_geohash_brin"),
+        ),
+        migrations.AddIndex(
+            model_name="dbpoint",
+            index=models.Index(fields=["geohash", "id"], name="geo_api_dbpoint_gh_order"),
+        ),
+    ]
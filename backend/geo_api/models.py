@@ -1,19 +1,64 @@
+import uuid
+
 from django.contrib.gis.db import models
+from django.contrib.gis.db.models.functions import GeoHash
+from django.contrib.postgres.indexes import BrinIndex
+from django.core.serializers.json import DjangoJSONEncoder
+
+from geo_api.geohash import GEOHASH_PRECISION, encode
 
 DEFAULT_SRID = 4326
 
 
+class DBPointQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.set_geohash()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class DBPoint(models.Model):
     location = models.PointField()
+    # GeoHash of location, kept up to date by save() and bulk_create(). A plain column, unlike an expression,
+    # can be the partition key and part of the primary key of a partitioned table (see tune_point_storage)
+    geohash = models.CharField(max_length=GEOHASH_PRECISION, editable=False)
+
+    objects = DBPointQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Compact index on the GeoHash space-filling curve, efficient once the table is clustered in that order
+            BrinIndex(fields=["geohash"], name="geo_api_dbpoint_geohash_brin"),
+            # Precomputed sort key of `?order=geohash`
+            models.Index(fields=["geohash", "id"], name="geo_api_dbpoint_gh_order"),
+        ]
 
     def __str__(self):
         return f"Point: {self.location}"
 
+    def set_geohash(self):
+        location = self.location
+        if location.srid not in (None, DEFAULT_SRID):
+            location = location.transform(DEFAULT_SRID, clone=True)
+        self.geohash = encode(location.x, location.y)
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.set_geohash()
+        if update_fields is not None and "location" in update_fields:
+            update_fields = {*update_fields, "geohash"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class DBLineString(models.Model):
     name = models.CharField(max_length=50, null=True, blank=True)
     line = models.LineStringField()
 
+    class Meta:
+        indexes = [
+            models.Index(GeoHash("line", precision=GEOHASH_PRECISION), "id", name="geo_api_dblinestring_gh_order"),
+        ]
+
     def __str__(self):
         return self.name or f"LineString: {self.line}"
 
@@ -22,5 +67,77 @@ class DBPolygon(models.Model):
     name = models.CharField(max_length=50, null=True, blank=True)
     polygon = models.PolygonField()
 
+    class Meta:
+        indexes = [
+            models.Index(GeoHash("polygon", precision=GEOHASH_PRECISION), "id", name="geo_api_dbpolygon_gh_order"),
+        ]
+
     def __str__(self):
         return self.name or f"Polygon: {self.polygon}"
+
+
+class DBPointPolygonMembership(models.Model):
+    """
+    Precomputed intersections of points and polygons, used by the polygon intersection endpoint
+    when GEO_API_MEMBERSHIP_INDEX is enabled. Maintained by geo_api.membership.
+    """
+
+    # No database constraint, so DBPoint can be partitioned (see tune_point_storage)
+    point = models.ForeignKey(
+        DBPoint, on_delete=models.CASCADE, related_name="polygon_memberships", db_constraint=False
+    )
+    # Indexed by the unique constraint
+    polygon = models.ForeignKey(DBPolygon, on_delete=models.CASCADE, related_name="point_memberships", db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["polygon", "point"], name="unique_polygon_point_membership"),
+        ]
+
+    def __str__(self):
+        return f"Point {self.point_id} in Polygon {self.polygon_id}"
+
+
+class GeoJob(models.Model):
+    """
+    Spatial operation executed in the background by `run_geo_workers`, see geo_api.jobs.
+    """
+
+    class Operation(models.TextChoices):
+        POLYGON_INTERSECTION = "polygon_intersection"
+        JOIN_LINES = "join_lines"
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    operation = models.CharField(max_length=30, choices=Operation.choices)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    # Response of the operation, returned with `status_code` once the job is finished
+    result = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    timeout = models.FloatField(help_text="Seconds the operation is allowed to run")
+    worker = models.CharField(max_length=100, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    deadline = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Queue of pending jobs, kept small by the condition
+            models.Index(
+                fields=["created_at"], condition=models.Q(status="pending"), name="geo_api_geojob_pending_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} job {self.id}: {self.status}"
+
+    @property
+    def finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
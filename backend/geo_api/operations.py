@@ -0,0 +1,75 @@
+"""
+Spatial operations behind the action endpoints.
+
+They are executed either inside the request or, in async mode, by the job workers of geo_api.jobs.
+Each operation tells found from not found ids and computes its result in a single query, with ids bound
+as one array literal (see geo_api.lookups), so large id lists cost no extra round trips.
+"""
+
+import json
+
+from django.conf import settings
+from django.contrib.gis.db.models import Union
+from django.contrib.gis.geos import GEOSGeometry
+from django.db.models import BooleanField, Exists, ExpressionWrapper, F, Min, OuterRef, Q, Window
+from rest_framework import status
+
+from geo_api.models import DBPoint, DBLineString, DBPointPolygonMembership
+from geo_api.profiling import timed
+from geo_api.serializers.geospatial_data import PointSerializer
+
+
+class OperationError(Exception):
+    """Expected failure of an operation, reported to the client with `status_code`."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def polygon_intersection(polygon, point_ids):
+    """
+    Return points of `point_ids` intersecting `polygon` in GeoJSON format.
+    """
+    intersecting_points = find_intersections(DBPoint.objects.filter(id__any=point_ids), polygon)
+    if intersecting_points is None:
+        raise OperationError("No Points found for provided IDs", status.HTTP_404_NOT_FOUND)
+    return PointSerializer(intersecting_points, many=True).data
+
+
+def find_intersections(points, polygon):
+    """
+    Find points that intersects with the specified polygon, or return None when `points` is empty.
+
+    The intersection test is evaluated by PostGIS, the query returns intersecting points and, to detect
+    that some of the points exist, the one with the lowest id whether it intersects or not.
+    The lowest id is a window over the selected points, so the filter of `points` (e.g. the id array)
+    is bound and evaluated only once.
+    With GEO_API_MEMBERSHIP_INDEX enabled the precomputed membership table is looked up instead.
+    """
+    if settings.GEO_API_MEMBERSHIP_INDEX:
+        condition = Exists(DBPointPolygonMembership.objects.filter(point=OuterRef("pk"), polygon=polygon))
+    else:
+        condition = ExpressionWrapper(Q(location__intersects=polygon.polygon), output_field=BooleanField())
+    rows = list(
+        points.annotate(intersects=condition, first_found=Window(Min("pk"))).filter(
+            Q(intersects=True) | Q(pk=F("first_found"))
+        )
+    )
+    if not rows:
+        return None
+    return [point for point in rows if point.intersects]
+
+
+def join_lines(line_ids):
+    """
+    Merge LineStrings of `line_ids` and return the result in GeoJSON format.
+    """
+    # The union of no rows is NULL
+    combined_geometry = DBLineString.objects.filter(id__any=line_ids).aggregate(union=Union("line"))["union"]
+    if combined_geometry is None:
+        raise OperationError("No LineStrings found for provided IDs", status.HTTP_404_NOT_FOUND)
+
+    with timed("geometry"):
+        merged_line = combined_geometry.merged
+        return json.loads(GEOSGeometry(merged_line.wkt).geojson)
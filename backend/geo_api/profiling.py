@@ -0,0 +1,248 @@
+"""
+Per-request profiling of the geo API.
+
+`ProfilingMiddleware` measures every request and breaks its duration down into time spent
+in the database, in GEOS geometry operations, in serialization and in rendering.
+Measurements are exposed as a `Server-Timing` header, as a structured log line
+and as Prometheus-style metrics served by `geo_api.api_views.metrics`.
+"""
+
+import cProfile
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current_profile = ContextVar("geo_api_request_profile", default=None)
+
+# Buckets (in seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+TIMED_PHASES = ("db", "geometry", "serialize", "render")
+
+
+class RequestProfile:
+    """Timings collected while a single request is being handled."""
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.query_count = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper, see https://docs.djangoproject.com/en/5.1/topics/db/instrumentation/
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings["db"] += time.perf_counter() - started
+            self.query_count += 1
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the duration of the wrapped block to `phase` of the profile of the current request.
+    Does nothing when the request is not profiled.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings[phase] += time.perf_counter() - started
+
+
+class TimedSerializerMixin:
+    """Serializer mixin which reports the time spent on turning model instances into primitives."""
+
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
+
+
+HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+
+
+def metric_family(name):
+    """
+    Return the family of a sample and its type, histograms are exposed as `_bucket`, `_sum` and `_count` samples.
+    """
+    for suffix in HISTOGRAM_SUFFIXES:
+        if name.startswith("geo_api_request_duration_seconds") and name.endswith(suffix):
+            return name.removesuffix(suffix), "histogram"
+    return name, "counter"
+
+
+def format_value(value):
+    # Counters of requests and bytes have to keep every digit, `:g` would round them to 6 significant ones
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    In-process store of Prometheus-style counters and histograms.
+    Every worker process keeps its own registry, so metrics are per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def observe(self, view, method, status_code, total, profile, response_bytes):
+        labels = (("view", view), ("method", method))
+        with self._lock:
+            self._values["geo_api_requests_total", labels + (("status", str(status_code)),)] += 1
+            self._values["geo_api_request_duration_seconds_sum", labels] += total
+            self._values["geo_api_request_duration_seconds_count", labels] += 1
+            for bucket in DURATION_BUCKETS:
+                if total <= bucket:
+                    self._values["geo_api_request_duration_seconds_bucket", labels + (("le", str(bucket)),)] += 1
+            self._values["geo_api_request_duration_seconds_bucket", labels + (("le", "+Inf"),)] += 1
+            for phase in TIMED_PHASES:
+                self._values[f"geo_api_{phase}_seconds_total", labels] += profile.timings[phase]
+            self._values["geo_api_db_queries_total", labels] += profile.query_count
+            if response_bytes is not None:
+                self._values["geo_api_response_bytes_total", labels] += response_bytes
+
+    def render(self):
+        """
+        Return metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = []
+        declared = set()
+        for (name, labels), value in values:
+            family, metric_type = metric_family(name)
+            if family not in declared:
+                declared.add(family)
+                lines.append(f"# TYPE {family} {metric_type}")
+            rendered_labels = ",".join(f'{key}="{label}"' for key, label in labels)
+            lines.append(f"{name}{{{rendered_labels}}} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+registry = MetricsRegistry()
+
+
+def server_timing_header(profile, total):
+    parts = [f'db;desc="{profile.query_count} queries";dur={profile.timings["db"] * 1000:.2f}']
+    parts.extend(f"{phase};dur={profile.timings[phase] * 1000:.2f}" for phase in TIMED_PHASES[1:])
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class ProfilingMiddleware:
+    """
+    Profile every request and publish the measurements.
+
+    Settings:
+        - GEO_API_PROFILING: enables the middleware.
+        - GEO_API_SERVER_TIMING: adds the `Server-Timing` header to responses.
+        - GEO_API_PROFILE_SAMPLE_RATE: fraction of requests executed under cProfile.
+        - GEO_API_SLOW_REQUEST_MS: sampled requests slower than this are dumped to GEO_API_PROFILE_DIR.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.GEO_API_PROFILING:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        profiler = self._start_profiler()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+            _current_profile.reset(token)
+        total = time.perf_counter() - started
+
+        view = request.resolver_match.url_name if request.resolver_match else None
+        if view == "metrics":
+            return response
+
+        response_bytes = None if response.streaming else len(response.content)
+        if settings.GEO_API_SERVER_TIMING:
+            response["Server-Timing"] = server_timing_header(profile, total)
+        registry.observe(view or "unresolved", request.method, response.status_code, total, profile, response_bytes)
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request_profile",
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view,
+                    "status": response.status_code,
+                    "total_ms": round(total * 1000, 3),
+                    "db_queries": profile.query_count,
+                    **{f"{phase}_ms": round(profile.timings[phase] * 1000, 3) for phase in TIMED_PHASES},
+                    "response_bytes": response_bytes,
+                }
+            )
+        )
+        if profiler and total * 1000 >= settings.GEO_API_SLOW_REQUEST_MS:
+            self._dump_profile(profiler, view, total)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Called right before a DRF response is rendered, the post render callback closes the measurement.
+        """
+        profile = _current_profile.get()
+        if profile is None:
+            return response
+        started = time.perf_counter()
+
+        def record_render_time(rendered_response):
+            profile.timings["render"] += time.perf_counter() - started
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+    def _start_profiler(self):
+        if random.random() >= settings.GEO_API_PROFILE_SAMPLE_RATE:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return None
+        return profiler
+
+    def _dump_profile(self, profiler, view, total):
+        directory = Path(settings.GEO_API_PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{view or 'unresolved'}-{total * 1000:.0f}ms.prof"
+        profiler.dump_stats(path)
+        logger.warning("Slow request profile stored in %s", path)
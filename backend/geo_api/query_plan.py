@@ -0,0 +1,201 @@
+"""
+Guard against query regressions of the geo API.
+
+`QueryPlanGuard` captures every SQL statement executed inside its block, then runs `EXPLAIN`
+on each of them. It reports a violation when:
+    - more statements than the budget have been executed (savepoints are not counted, an `executemany`
+      counts once),
+    - the same statement has been executed repeatedly (a sign of per-row N+1 queries),
+    - a spatial predicate on `location`, `line` or `polygon` is evaluated by a sequential scan or as the
+      join filter of a nested loop instead of the GiST index.
+
+Plans are explained with `enable_seqscan` switched off, so the planner picks an index whenever
+one can be used, even for the handful of rows present in the test database.
+"""
+
+import json
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+SPATIAL_COLUMNS = ("location", "line", "polygon")
+
+SPATIAL_PREDICATE_RE = re.compile(
+    r"(\b_?st_(intersects|contains|containsproperly|within|covers|coveredby|dwithin|dfullywithin|overlaps|"
+    r"touches|crosses|equals|disjoint|relate)\b|&&)",
+    re.IGNORECASE,
+)
+SPATIAL_COLUMN_RE = re.compile(r"\b({})\b".format("|".join(SPATIAL_COLUMNS)))
+EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+# Savepoints are statements only inside an outer transaction, e.g. the one wrapping every TestCase,
+# counting them would make budgets of tests and of production requests differ
+TRANSACTION_CONTROL_RE = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+SEQUENTIAL_SCANS = ("Seq Scan", "Parallel Seq Scan")
+
+
+class QueryPlanViolation(Exception):
+    pass
+
+
+class CapturedQuery:
+    def __init__(self, alias, sql, params, many=False):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        # params of `executemany` are a list of parameter sets
+        self.many = many
+
+    def __str__(self):
+        return self.sql
+
+
+class QueryPlanGuard:
+    """
+    Context manager capturing SQL statements and checking them against a query budget and their plans.
+
+    Usage:
+        with QueryPlanGuard(max_queries=2) as guard:
+            ...
+        guard.check()
+    """
+
+    def __init__(self, max_queries=None, max_repeats=1, explain=True):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.explain = explain
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self._capture(connection.alias)))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+    def _capture(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            if not TRANSACTION_CONTROL_RE.match(sql):
+                self.queries.append(CapturedQuery(alias, sql, params, many))
+            return execute(sql, params, many, context)
+
+        return wrapper
+
+    def violations(self):
+        """
+        Return a list of human readable descriptions of every detected problem.
+        """
+        problems = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append(
+                f"{len(self.queries)} queries executed, budget is {self.max_queries}:\n"
+                + "\n".join(f"  {query}" for query in self.queries)
+            )
+        if self.max_repeats is not None:
+            for sql, count in Counter(query.sql for query in self.queries).items():
+                if count > self.max_repeats and EXPLAINABLE_RE.match(sql):
+                    problems.append(f"Statement executed {count} times (possible N+1 queries): {sql}")
+        if self.explain:
+            for query in self.queries:
+                if EXPLAINABLE_RE.match(query.sql) and not query.many:
+                    for node in sequential_spatial_scans(explain(query)):
+                        problems.append(
+                            f"Spatial predicate evaluated by {node['Node Type']} on {node.get('Relation Name')} "
+                            f"instead of the GiST index ({spatial_condition(node)}): {query.sql}"
+                        )
+        return problems
+
+    def check(self):
+        problems = self.violations()
+        if problems:
+            raise QueryPlanViolation("\n".join(problems))
+
+
+def explain(query):
+    """
+    Return the JSON plan of a captured query, explained with sequential scans discouraged.
+    The statement itself is not executed.
+    """
+    with transaction.atomic(using=query.alias):
+        with connections[query.alias].cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {query.sql}", query.params)
+            plan = cursor.fetchone()[0]
+        # Rolling back the savepoint restores enable_seqscan
+        transaction.set_rollback(True, using=query.alias)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def iter_plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+def spatial_condition(node):
+    """
+    Return the condition of a plan node evaluating a spatial predicate on one of SPATIAL_COLUMNS without
+    an index, or None.
+    Joins evaluating the predicate by the GiST index show it as the index condition of their inner scan,
+    a predicate left in the `Join Filter` is tested against every pair of rows.
+    """
+    conditions = [node.get("Join Filter", "")]
+    if node["Node Type"] in SEQUENTIAL_SCANS:
+        conditions.append(node.get("Filter", ""))
+    for condition in conditions:
+        if SPATIAL_PREDICATE_RE.search(condition) and SPATIAL_COLUMN_RE.search(condition):
+            return condition
+    return None
+
+
+def sequential_spatial_scans(plan):
+    """
+    Yield sequential scan and join nodes evaluating a spatial predicate without the GiST index.
+    """
+    for node in iter_plan_nodes(plan):
+        if spatial_condition(node):
+            yield node
+
+
+class QueryPlanGuardMiddleware:
+    """
+    Runtime debug mode of `QueryPlanGuard`, controlled by the GEO_API_QUERY_GUARD setting:
+        - "off": disabled,
+        - "log": violations are logged as warnings,
+        - "raise": violations raise `QueryPlanViolation`.
+
+    The query budget of a request is taken from the `query_budget` attribute of its view,
+    the allowed number of repeated statements from `max_query_repeats` (1 by default).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.GEO_API_QUERY_GUARD == "off":
+            return self.get_response(request)
+
+        with QueryPlanGuard() as guard:
+            response = self.get_response(request)
+
+        view_class = getattr(getattr(request.resolver_match, "func", None), "view_class", None)
+        guard.max_queries = getattr(view_class, "query_budget", None)
+        guard.max_repeats = getattr(view_class, "max_query_repeats", guard.max_repeats)
+        problems = guard.violations()
+        if problems:
+            message = f"{request.method} {request.path}:\n" + "\n".join(problems)
+            if settings.GEO_API_QUERY_GUARD == "raise":
+                raise QueryPlanViolation(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,27 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class GeoJSONRenderer(JSONRenderer):
+    """
+    JSON renderer built on orjson, which encodes large GeoJSON payloads several times faster than stdlib json.
+    NumPy arrays (e.g. coordinate arrays) are serialized natively. Types orjson doesn't know,
+    such as Decimal or lazy translation strings, fall back to the encoder of the default DRF renderer.
+    """
+
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = self.options
+        # Indentation is requested by the browsable API and by `Accept: application/json; indent=N`,
+        # orjson only knows 2 spaces, any other width is rendered by the stdlib json of the DRF renderer
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent == 2:
+            options |= orjson.OPT_INDENT_2
+        elif indent:
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=JSONEncoder().default, option=options)
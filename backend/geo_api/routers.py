@@ -0,0 +1,89 @@
+"""
+Routing of reads to replicas configured by GEO_API_READ_REPLICAS, writes always go to the primary.
+
+A request reads from a random replica when it is a safe (GET, HEAD, OPTIONS) request, unless its view sets
+`use_replica = False`, or when its view sets `use_replica = True`, e.g. the read-only intersection and join
+endpoints. Everything else, including reads outside of requests, reads inside transactions and reads following
+a write, goes to the primary.
+
+Read-your-writes: a request which wrote to the database sets a cookie pinning the client to the primary
+for GEO_API_REPLICA_STICKINESS seconds, by then the replicas are expected to have caught up.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY_COOKIE = "geo_api_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingState:
+    """Routing decisions of a single request."""
+
+    def __init__(self, pinned=True):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_current_state = ContextVar("geo_api_routing_state", default=None)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current_state.get()
+        if (
+            not settings.GEO_API_READ_REPLICAS
+            # Outside of requests, e.g. in management commands and job workers, everything goes to the primary
+            or state is None
+            or state.pinned
+            # Reads inside a transaction have to see its writes, and `select_for_update` needs the primary
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.GEO_API_READ_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _current_state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReadReplicaMiddleware:
+    """
+    Decide whether reads of a request may go to replicas and pin clients which wrote to the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _current_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_state.reset(token)
+
+        if state.wrote and settings.GEO_API_READ_REPLICAS:
+            response.set_cookie(
+                PRIMARY_COOKIE, "1", max_age=settings.GEO_API_REPLICA_STICKINESS, httponly=True, samesite="Lax"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        read_only = getattr(view_class, "use_replica", request.method in SAFE_METHODS)
+        state = _current_state.get()
+        if state is not None and read_only and PRIMARY_COOKIE not in request.COOKIES:
+            state.pinned = False
@@ -1,10 +1,12 @@
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 from rest_framework import serializers
 
+from geo_api.geometry import NormalizedGeometryMixin
 from geo_api.models import DBPoint, DBLineString, DBPolygon
+from geo_api.profiling import TimedSerializerMixin
 
 
-class PointSerializer(GeoFeatureModelSerializer):
+class PointSerializer(TimedSerializerMixin, NormalizedGeometryMixin, GeoFeatureModelSerializer):
     """A class to serialize points as GeoJSON compatible data"""
 
     class Meta:
@@ -13,14 +15,14 @@ class PointSerializer(GeoFeatureModelSerializer):
         fields = ("id", "location")
 
 
-class LineStringSerializer(GeoFeatureModelSerializer):
+class LineStringSerializer(TimedSerializerMixin, NormalizedGeometryMixin, GeoFeatureModelSerializer):
     class Meta:
         model = DBLineString
         geo_field = "line"
         fields = ("id", "name", "line")
 
 
-class PolygonSerializer(GeoFeatureModelSerializer):
+class PolygonSerializer(TimedSerializerMixin, NormalizedGeometryMixin, GeoFeatureModelSerializer):
     class Meta:
         model = DBPolygon
         geo_field = "polygon"
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from geo_api.models import GeoJob
+
+
+class GeoJobSerializer(serializers.ModelSerializer):
+    """Status of a job of the async mode, the result itself is served by its `result_url`"""
+
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GeoJob
+        fields = (
+            "id",
+            "operation",
+            "status",
+            "status_code",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "result_url",
+        )
+
+    def get_result_url(self, job):
+        return reverse("job-result", kwargs={"pk": job.pk}, request=self.context.get("request"))
@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from geo_api.benchmarks.generators import generate_points, generate_road_network, generate_polygon_tiling
+from geo_api.benchmarks.id_lists import build_ids
+from geo_api.benchmarks.runner import percentile, summarize
+
+
+class GeneratorsTests(SimpleTestCase):
+    def test_points_are_deterministic(self):
+        first = [point.location.coords for point in generate_points(100, seed=1)]
+        second = [point.location.coords for point in generate_points(100, seed=1)]
+        other_seed = [point.location.coords for point in generate_points(100, seed=2)]
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other_seed)
+
+    def test_generators_yield_requested_count(self):
+        self.assertEqual(len(list(generate_points(10))), 10)
+        self.assertEqual(len(list(generate_road_network(17))), 17)
+        self.assertEqual(len(list(generate_polygon_tiling(17))), 17)
+
+    def test_consecutive_road_segments_share_vertices(self):
+        first, second = list(generate_road_network(16))[:2]
+
+        self.assertEqual(first.line.coords[-1], second.line.coords[0])
+
+    def test_polygon_tiles_are_valid_and_do_not_overlap(self):
+        tiles = [tile.polygon for tile in generate_polygon_tiling(9)]
+
+        self.assertTrue(all(tile.valid for tile in tiles))
+        self.assertEqual(tiles[0].intersection(tiles[1]).area, 0)
+
+
+class SummaryTests(SimpleTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize(self):
+        summary = summarize([0.1, 0.2, 0.3, 0.4])
+
+        self.assertAlmostEqual(summary["p50_ms"], 200)
+        self.assertAlmostEqual(summary["max_ms"], 400)
+        self.assertAlmostEqual(summary["requests_per_second"], 4)
+
+
+class IdListsTests(SimpleTestCase):
+    def test_build_ids(self):
+        self.assertEqual(build_ids(range(5, 8), 2), [5, 6])
+        self.assertEqual(build_ids(range(5, 8), 5), [5, 6, 7, 8, 9])
+        self.assertEqual(build_ids(range(0), 2), [1, 2])
@@ -0,0 +1,104 @@
+import gzip
+import json
+from decimal import Decimal
+
+from django.contrib.gis.geos import Point
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api.compression import CompressionMiddleware, GzipCompressor, compress_stream, negotiate, parse_accept_encoding
+from geo_api.models import DBPoint
+from geo_api.renderers import GeoJSONRenderer
+
+
+class GeoJSONRendererTests(SimpleTestCase):
+    def test_render(self):
+        data = {"type": "Point", "coordinates": (12.4924, 41.8902), "area": Decimal("1.5")}
+
+        self.assertEqual(
+            json.loads(GeoJSONRenderer().render(data)),
+            {"type": "Point", "coordinates": [12.4924, 41.8902], "area": 1.5},
+        )
+
+    def test_render_indented(self):
+        self.assertEqual(GeoJSONRenderer().render({"id": 1}, "application/json; indent=2"), b'{\n  "id": 1\n}')
+        self.assertEqual(GeoJSONRenderer().render({"id": 1}, "application/json; indent=4"), b'{\n    "id": 1\n}')
+
+    def test_render_none(self):
+        self.assertEqual(GeoJSONRenderer().render(None), b"")
+
+
+class NegotiationTests(SimpleTestCase):
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding("gzip, br;q=0.5, *;q=0"), {"gzip": 1.0, "br": 0.5, "*": 0.0})
+
+    def test_negotiate(self):
+        self.assertIs(negotiate("gzip"), GzipCompressor)
+        self.assertIs(negotiate("gzip;q=1, identity"), GzipCompressor)
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate(""))
+        self.assertIsNone(negotiate("gzip;q=0"))
+
+
+class CompressStreamTests(SimpleTestCase):
+    def test_flush_threshold(self):
+        compressor = GzipCompressor(6)
+        flushes = []
+        flush = compressor.flush
+        compressor.flush = lambda: flushes.append(None) or flush()
+        chunks = [b'{"id": %d}, ' % x for x in range(1000)]
+
+        content = b"".join(compress_stream(compressor, chunks, flush_bytes=1024))
+
+        self.assertEqual(gzip.decompress(content), b"".join(chunks))
+        self.assertEqual(len(flushes), sum(map(len, chunks)) // 1024)
+
+
+class PassThroughTests(SimpleTestCase):
+    def compress(self, **headers):
+        status_code = headers.pop("status", 200)
+        response = HttpResponse(b"x" * 4096, status=status_code, headers=headers)
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_complete_response_compressed(self):
+        self.assertEqual(self.compress()["Content-Encoding"], "gzip")
+
+    def test_passed_through(self):
+        for headers in (
+            {"status": 206, "Content-Range": "bytes 0-4095/8192"},
+            {"Content-Range": "bytes 0-4095/4096"},
+            {"status": 404},
+            {"Cache-Control": "public, no-transform"},
+        ):
+            with self.subTest(headers=headers):
+                self.assertFalse(self.compress(**headers).has_header("Content-Encoding"))
+
+
+class CompressionMiddlewareTests(APITestCase):
+    def setUp(self):
+        DBPoint.objects.bulk_create(DBPoint(location=Point(x / 10, x / 20)) for x in range(100))
+        self.list_url = reverse("point-list-create")
+
+    def test_gzip(self):
+        plain = self.client.get(self.list_url)
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_not_accepted(self):
+        response = self.client.get(self.list_url)
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(GEO_API_COMPRESSION_MIN_BYTES=10**9)
+    def test_small_response(self):
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
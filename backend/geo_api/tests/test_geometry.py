@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.contrib.gis.geos import Point, LineString, Polygon
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api.geometry import GeometryError, normalize, normalize_many
+from geo_api.models import DBPoint, DBLineString, DBPolygon, DEFAULT_SRID
+
+BOWTIE = ((0, 0), (2, 2), (2, 0), (0, 2), (0, 0))
+# The ring touches itself at (2, 4), enclosing a triangular hole
+SELF_TOUCHING_RING = ((0, 0), (4, 0), (4, 4), (2, 4), (3, 2), (1, 2), (2, 4), (0, 4), (0, 0))
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_duplicate_vertices_removed(self):
+        line = normalize(LineString((0, 0), (0, 0), (1, 1), (1, 1)), "LINESTRING")
+
+        self.assertEqual(line.coords, ((0, 0), (1, 1)))
+        self.assertEqual(line.srid, DEFAULT_SRID)
+
+    def test_reprojection(self):
+        point = normalize(Point(2226389.8158654715, 0, srid=3857), "POINT")
+
+        self.assertEqual(point.srid, DEFAULT_SRID)
+        self.assertAlmostEqual(point.x, 20, places=6)
+
+    def test_out_of_range_coordinates_rejected(self):
+        with self.assertRaises(GeometryError):
+            normalize(LineString((179, 0), (181, 0)), "LINESTRING")
+
+    def test_invalid_geometry_rejected(self):
+        with self.assertRaises(GeometryError):
+            normalize(Polygon(BOWTIE), "POLYGON", repair=False)
+
+    def test_invalid_geometry_repaired(self):
+        polygon = normalize(Polygon(SELF_TOUCHING_RING), "POLYGON", repair=True)
+
+        self.assertTrue(polygon.valid)
+        self.assertEqual(polygon.geom_type, "Polygon")
+        self.assertAlmostEqual(polygon.area, 14)
+
+    def test_repair_changing_geometry_type(self):
+        # The bowtie falls apart into a MultiPolygon
+        with self.assertRaises(GeometryError):
+            normalize(Polygon(BOWTIE), "POLYGON", repair=True)
+
+
+class NormalizeManyTests(TestCase):
+    def test_batch(self):
+        lines = normalize_many(
+            [LineString((0, 0), (0, 0), (1, 1)), LineString((0, 0), (2226389.8158654715, 0), srid=3857)], "LINESTRING"
+        )
+
+        self.assertEqual(lines[0].coords, ((0, 0), (1, 1)))
+        self.assertEqual(lines[1].srid, DEFAULT_SRID)
+        self.assertAlmostEqual(lines[1].coords[1][0], 20, places=6)
+
+    def test_invalid_geometry_in_batch(self):
+        with self.assertRaisesMessage(GeometryError, "position 1"):
+            normalize_many([Polygon(SELF_TOUCHING_RING), Polygon(BOWTIE)], "POLYGON", repair=True)
+
+
+class GeometryValidationAPITests(APITestCase):
+    def test_invalid_polygon_rejected(self):
+        data = {"polygon": {"type": "Polygon", "coordinates": [BOWTIE]}}
+        response = self.client.post(reverse("polygon-list-create"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("polygon", response.data)
+        self.assertFalse(DBPolygon.objects.exists())
+
+    def test_out_of_range_point_rejected(self):
+        data = {"location": {"type": "Point", "coordinates": [200, 10]}}
+        response = self.client.post(reverse("point-list-create"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("location", response.data)
+        self.assertFalse(DBPoint.objects.exists())
+
+    def test_duplicate_vertices_removed(self):
+        data = {"line": {"type": "LineString", "coordinates": [[0, 0], [0, 0], [1, 1]]}}
+        response = self.client.post(reverse("linestring-list-create"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DBLineString.objects.get().line.coords, ((0, 0), (1, 1)))
+
+
+class RepairGeometriesCommandTests(TestCase):
+    def setUp(self):
+        # Saved directly, bypassing validation of the serializers
+        self.polygon = DBPolygon.objects.create(polygon=Polygon(SELF_TOUCHING_RING))
+        self.bowtie = DBPolygon.objects.create(polygon=Polygon(BOWTIE))
+
+    def test_dry_run(self):
+        output = StringIO()
+        call_command("repair_geometries", "--models", "polygons", "--workers", "1", "--dry-run", stdout=output)
+
+        self.assertIn("polygons: 1 rows would be changed, 1 can't be repaired", output.getvalue())
+        self.polygon.refresh_from_db()
+        self.assertFalse(self.polygon.polygon.valid)
+
+    def test_repair(self):
+        output = StringIO()
+        call_command("repair_geometries", "--workers", "1", "--chunk-size", "1", stdout=output)
+
+        self.assertIn("polygons: 1 rows changed, 1 can't be repaired", output.getvalue())
+        self.polygon.refresh_from_db()
+        self.assertTrue(self.polygon.polygon.valid)
+        self.bowtie.refresh_from_db()
+        self.assertFalse(self.bowtie.polygon.valid)
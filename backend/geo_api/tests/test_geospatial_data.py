@@ -4,9 +4,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from geo_api.models import DBPoint, DBLineString, DBPolygon, DEFAULT_SRID
+from geo_api.tests.utils import QueryPlanAssertionsMixin
 
 
-class PointAPITests(APITestCase):
+class PointAPITests(QueryPlanAssertionsMixin, APITestCase):
 
     def setUp(self):
         self.berlin_coordinates = [12.4924, 41.8902]
@@ -20,7 +21,8 @@ class PointAPITests(APITestCase):
         self.data_example = {"location": {"type": "Point", "coordinates": self.berlin_coordinates}}
 
     def test_create_point(self):
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(DBPoint.objects.count(), 2)
@@ -28,19 +30,22 @@ class PointAPITests(APITestCase):
 
     def test_create_point_with_invalid_data(self):
         self.data_example["location"]["type"] = ""  # invalid data
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(0):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(DBPoint.objects.count(), 1)
 
     def test_list_points(self):
-        response = self.client.get(self.list_create_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.list_create_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["features"]), 1)
 
     def test_retrieve_point(self):
-        response = self.client.get(self.point_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.point_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["geometry"]["type"], "Point")
@@ -49,7 +54,8 @@ class PointAPITests(APITestCase):
 
     def test_update_point(self):
         self.data_example["location"]["coordinates"] = self.warsaw_coordinates
-        response = self.client.put(self.point_url, self.data_example, format="json")
+        with self.assertQueryPlan(2):
+            response = self.client.put(self.point_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.point.refresh_from_db()
@@ -57,20 +63,22 @@ class PointAPITests(APITestCase):
 
     def test_update_point_with_invalid_data(self):
         self.data_example["location"]["type"] = ""  # invalid data
-        response = self.client.put(self.point_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.put(self.point_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.point.refresh_from_db()
         self.assertEqual(self.point.location, Point(*self.berlin_coordinates, srid=DEFAULT_SRID))
 
     def test_delete_point(self):
-        response = self.client.delete(self.point_url)
+        with self.assertQueryPlan(3):
+            response = self.client.delete(self.point_url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(DBPoint.objects.count(), 0)
 
 
-class LineStringAPITests(APITestCase):
+class LineStringAPITests(QueryPlanAssertionsMixin, APITestCase):
     def setUp(self):
         self.coordinates_for_request = [[12.4924, 41.8902], [13.4050, 52.5200]]
         self.coordinates = [[22.4924, 41.8902], [23.4050, 52.5200]]
@@ -83,7 +91,8 @@ class LineStringAPITests(APITestCase):
         self.list_create_url = reverse("linestring-list-create")
 
     def test_create_linestring(self):
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(DBLineString.objects.count(), 2)
@@ -91,27 +100,31 @@ class LineStringAPITests(APITestCase):
 
     def test_create_linestring_with_invalid_data(self):
         self.data_example["line"]["type"] = "Point"  # invalid data
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(0):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(DBLineString.objects.count(), 1)
 
     def test_list_linestrings(self):
-        response = self.client.get(self.list_create_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.list_create_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["features"]), 1)
         self.assertEqual(response.data["features"][0]["id"], self.line_string.id)
 
     def test_retrieve_linestring(self):
-        response = self.client.get(self.line_string_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.line_string_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.line_string.id)
 
     def test_update_linestring(self):
         self.data_example["name"] = "New name"
-        response = self.client.put(self.line_string_url, self.data_example, format="json")
+        with self.assertQueryPlan(2):
+            response = self.client.put(self.line_string_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.line_string.refresh_from_db()
@@ -121,20 +134,22 @@ class LineStringAPITests(APITestCase):
         old_name = self.line_string.name
         self.data_example["line"]["type"] = "Point"  # invalid data
         self.data_example["name"] = "New name"
-        response = self.client.put(self.line_string_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.put(self.line_string_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.line_string.refresh_from_db()
         self.assertEqual(self.line_string.name, old_name)
 
     def test_delete_linestring(self):
-        response = self.client.delete(self.line_string_url)
+        with self.assertQueryPlan(2):
+            response = self.client.delete(self.line_string_url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(DBLineString.objects.count(), 0)
 
 
-class PolygonAPITests(APITestCase):
+class PolygonAPITests(QueryPlanAssertionsMixin, APITestCase):
     def setUp(self):
         self.coordinates = [[[12.4924, 41.8902], [13.4050, 52.5200], [14.4974, 53.5653], [12.4924, 41.8902]]]
         self.coordinates_for_request = [
@@ -150,7 +165,8 @@ class PolygonAPITests(APITestCase):
         self.list_create_url = reverse("polygon-list-create")
 
     def test_create_polygon(self):
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(DBPolygon.objects.count(), 2)
@@ -161,27 +177,31 @@ class PolygonAPITests(APITestCase):
     def test_create_polygon_with_invalid_data(self):
         self.data_example["name"] = "New name"
         self.data_example["polygon"]["type"] = "LineString"  # invalid data
-        response = self.client.post(self.list_create_url, self.data_example, format="json")
+        with self.assertQueryPlan(0):
+            response = self.client.post(self.list_create_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(DBPolygon.objects.count(), 1)
 
     def test_list_polygons(self):
-        response = self.client.get(self.list_create_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.list_create_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["features"]), 1)
         self.assertEqual(response.data["features"][0]["id"], self.polygon.id)
 
     def test_retrieve_polygon(self):
-        response = self.client.get(self.polygon_url)
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.polygon_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.polygon.id)
 
     def test_update_polygon(self):
         self.data_example["name"] = "New name"
-        response = self.client.put(self.polygon_url, self.data_example, format="json")
+        with self.assertQueryPlan(2):
+            response = self.client.put(self.polygon_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.polygon.refresh_from_db()
@@ -191,14 +211,16 @@ class PolygonAPITests(APITestCase):
         old_name = self.polygon.name
         self.data_example["name"] = "New name"
         self.data_example["polygon"]["type"] = "LineString"  # invalid data
-        response = self.client.put(self.polygon_url, self.data_example, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.put(self.polygon_url, self.data_example, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.polygon.refresh_from_db()
         self.assertEqual(self.polygon.name, old_name)
 
     def test_delete_polygon(self):
-        response = self.client.delete(self.polygon_url)
+        with self.assertQueryPlan(3):
+            response = self.client.delete(self.polygon_url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(DBLineString.objects.count(), 0)
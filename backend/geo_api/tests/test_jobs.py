@@ -0,0 +1,141 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.gis.geos import Point, LineString, Polygon
+from django.db import OperationalError, connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from psycopg2.errors import QueryCanceled
+from rest_framework.test import APITestCase
+
+from geo_api import jobs
+from geo_api.models import DBPoint, DBLineString, DBPolygon, GeoJob
+
+
+class AsyncModeTests(APITestCase):
+    def setUp(self):
+        self.polygon = DBPolygon.objects.create(polygon=Polygon(((0, 0), (0, 2), (2, 2), (2, 0), (0, 0))))
+        self.points = [DBPoint.objects.create(location=Point(1, 1)), DBPoint.objects.create(location=Point(5, 5))]
+        self.lines = [
+            DBLineString.objects.create(line=LineString((0, 0), (1, 1))),
+            DBLineString.objects.create(line=LineString((1, 1), (2, 2))),
+        ]
+        self.intersection_url = reverse("polygon-intersection", args=[self.polygon.id])
+        self.join_url = reverse("join-lines")
+
+    def test_intersection_job(self):
+        data = {"points": [point.id for point in self.points]}
+        response = self.client.post(f"{self.intersection_url}?async=true", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response["Location"], response.data["url"])
+        result_url = reverse("job-result", args=[response.data["job_id"]])
+        self.assertEqual(self.client.get(result_url).status_code, status.HTTP_202_ACCEPTED)
+
+        self.assertEqual(jobs.work(burst=True), 1)
+
+        job_response = self.client.get(response.data["url"])
+        self.assertEqual(job_response.data["status"], GeoJob.Status.SUCCEEDED)
+        result = self.client.get(result_url)
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.json(), self.client.post(self.intersection_url, data, format="json").json())
+
+    def test_join_job(self):
+        response = self.client.post(
+            f"{self.join_url}?async=true", {"lines": [line.id for line in self.lines]}, format="json"
+        )
+        jobs.work(burst=True)
+
+        result = self.client.get(reverse("job-result", args=[response.data["job_id"]]))
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.json()["type"], "LineString")
+
+    def test_failed_job_keeps_status_code(self):
+        response = self.client.post(f"{self.join_url}?async=true", {"lines": [999]}, format="json")
+        jobs.work(burst=True)
+
+        job = GeoJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.status, GeoJob.Status.FAILED)
+        result = self.client.get(reverse("job-result", args=[job.pk]))
+        self.assertEqual(result.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(result.json(), {"error": "No LineStrings found for provided IDs"})
+
+    def test_invalid_input_is_not_queued(self):
+        response = self.client.post(f"{self.join_url}?async=true", {"lines": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(GeoJob.objects.exists())
+
+
+class JobQueueTests(APITestCase):
+    def test_claim_oldest_job(self):
+        first = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [1]})
+        jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [2]})
+
+        job = jobs.claim_next_job("test-worker")
+
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, GeoJob.Status.RUNNING)
+        self.assertEqual(job.deadline, job.started_at + timedelta(seconds=job.timeout))
+
+    def test_fail_expired_jobs(self):
+        job = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [1]}, timeout=1)
+        GeoJob.objects.filter(pk=job.pk).update(
+            status=GeoJob.Status.RUNNING, deadline=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(jobs.fail_expired_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, GeoJob.Status.FAILED)
+        self.assertEqual(job.status_code, status.HTTP_504_GATEWAY_TIMEOUT)
+
+    @override_settings(GEO_API_JOB_RETENTION=60)
+    def test_delete_finished_jobs(self):
+        old = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [1]})
+        recent = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [2]})
+        GeoJob.objects.filter(pk=old.pk).update(
+            status=GeoJob.Status.SUCCEEDED, finished_at=timezone.now() - timedelta(seconds=61)
+        )
+        GeoJob.objects.filter(pk=recent.pk).update(status=GeoJob.Status.FAILED, finished_at=timezone.now())
+
+        jobs.work(burst=True)
+
+        self.assertFalse(GeoJob.objects.filter(pk=old.pk).exists())
+        self.assertTrue(GeoJob.objects.filter(pk=recent.pk).exists())
+
+    def run_failing_job(self, error):
+        job = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [1]})
+        operation = mock.Mock(side_effect=error)
+        # The test transaction can't be replaced by a new connection
+        with mock.patch.dict(jobs.OPERATIONS, {GeoJob.Operation.JOIN_LINES: operation}), mock.patch.object(
+            connection, "close"
+        ) as close, mock.patch("geo_api.jobs.time.sleep"):
+            jobs.work(burst=True)
+        job.refresh_from_db()
+        return job, close.called
+
+    def test_statement_timeout(self):
+        error = OperationalError("canceling statement due to statement timeout")
+        error.__cause__ = QueryCanceled()
+
+        job, reconnected = self.run_failing_job(error)
+
+        self.assertEqual(job.status_code, status.HTTP_504_GATEWAY_TIMEOUT)
+        self.assertFalse(reconnected)
+
+    def test_lost_connection(self):
+        job, reconnected = self.run_failing_job(OperationalError("server closed the connection unexpectedly"))
+
+        self.assertTrue(reconnected)
+        self.assertEqual(job.status, GeoJob.Status.FAILED)
+        self.assertEqual(job.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(job.result, {"error": "Job failed"})
+
+    def test_invalid_wait(self):
+        job = jobs.enqueue(GeoJob.Operation.JOIN_LINES, {"lines": [1]})
+
+        response = self.client.get(reverse("job-detail", args=[job.pk]), {"wait": "soon"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
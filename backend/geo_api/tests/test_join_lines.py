@@ -4,9 +4,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from geo_api.models import DBLineString
+from geo_api.tests.utils import QueryPlanAssertionsMixin
 
 
-class JoinLinesTestCase(APITestCase):
+class JoinLinesTestCase(QueryPlanAssertionsMixin, APITestCase):
 
     def setUp(self):
         self.coordinates = [[0.0, 0.0], [1.0, 1.0]]
@@ -22,7 +23,8 @@ class JoinLinesTestCase(APITestCase):
         self.join_lines_url = reverse("join-lines")
 
     def test_get_not_allowed(self):
-        response = self.client.get(self.join_lines_url)
+        with self.assertQueryPlan(0):
+            response = self.client.get(self.join_lines_url)
 
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
@@ -30,7 +32,8 @@ class JoinLinesTestCase(APITestCase):
         """
         Test should return status 400
         """
-        response = self.client.post(self.join_lines_url, data={"lines": []})
+        with self.assertQueryPlan(0):
+            response = self.client.post(self.join_lines_url, data={"lines": []})
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
@@ -38,7 +41,10 @@ class JoinLinesTestCase(APITestCase):
         """
         Test should return http status 400
         """
-        response = self.client.post(self.join_lines_url, data={"lines": [self.line_string.id + self.line_string2.id]})
+        with self.assertQueryPlan(1):
+            response = self.client.post(
+                self.join_lines_url, data={"lines": [self.line_string.id + self.line_string2.id]}
+            )
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
@@ -46,7 +52,10 @@ class JoinLinesTestCase(APITestCase):
         """
         Test should return http status 404
         """
-        response = self.client.post(self.join_lines_url, data={"lines": [self.line_string.id + self.line_string2.id]})
+        with self.assertQueryPlan(1):
+            response = self.client.post(
+                self.join_lines_url, data={"lines": [self.line_string.id + self.line_string2.id]}
+            )
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
@@ -59,7 +68,10 @@ class JoinLinesTestCase(APITestCase):
         # We take only second point from the second ListString as on this point lines should merge into one
         expected_response_data = {"type": "LineString", "coordinates": [*self.coordinates, self.coordinates2[1]]}
 
-        response = self.client.post(self.join_lines_url, data={"lines": [self.line_string.id, self.line_string2.id]})
+        with self.assertQueryPlan(1):
+            response = self.client.post(
+                self.join_lines_url, data={"lines": [self.line_string.id, self.line_string2.id]}
+            )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(response.data, expected_response_data)
@@ -73,7 +85,10 @@ class JoinLinesTestCase(APITestCase):
         # We take only second point from the second ListString as on this point lines should merge into one
         expected_response_data = {"type": "MultiLineString", "coordinates": [self.coordinates3, self.coordinates4]}
 
-        response = self.client.post(self.join_lines_url, data={"lines": [self.line_string3.id, self.line_string4.id]})
+        with self.assertQueryPlan(1):
+            response = self.client.post(
+                self.join_lines_url, data={"lines": [self.line_string3.id, self.line_string4.id]}
+            )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(response.data, expected_response_data)
@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.contrib.gis.geos import Point, Polygon
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api import membership
+from geo_api.membership import _insert_memberships
+from geo_api.models import DBPoint, DBPolygon, DBPointPolygonMembership
+
+
+@override_settings(GEO_API_MEMBERSHIP_INDEX=True)
+class MembershipIndexTests(APITestCase):
+    def setUp(self):
+        self.polygon = DBPolygon.objects.create(polygon=Polygon(((0, 0), (0, 2), (2, 2), (2, 0), (0, 0))))
+        self.inside = DBPoint.objects.create(location=Point(1, 1))
+        self.outside = DBPoint.objects.create(location=Point(5, 5))
+
+    def memberships(self):
+        return set(DBPointPolygonMembership.objects.values_list("point_id", "polygon_id"))
+
+    def test_point_saved(self):
+        self.assertEqual(self.memberships(), {(self.inside.id, self.polygon.id)})
+
+        self.outside.location = Point(1.5, 1.5)
+        self.outside.save()
+        self.inside.location = Point(3, 3)
+        self.inside.save()
+
+        self.assertEqual(self.memberships(), {(self.outside.id, self.polygon.id)})
+
+    def test_polygon_saved(self):
+        self.polygon.polygon = Polygon(((4, 4), (4, 6), (6, 6), (6, 4), (4, 4)))
+        self.polygon.save()
+
+        self.assertEqual(self.memberships(), {(self.outside.id, self.polygon.id)})
+
+    def test_deleted(self):
+        self.inside.delete()
+
+        self.assertEqual(self.memberships(), set())
+
+    def test_existing_pairs_skipped(self):
+        # What a polygon saved concurrently with the point would insert
+        self.assertEqual(_insert_memberships("p.id = %s", [self.inside.id]), 0)
+
+        self.assertEqual(self.memberships(), {(self.inside.id, self.polygon.id)})
+
+    def test_rebuild_command(self):
+        DBPointPolygonMembership.objects.all().delete()
+        DBPoint.objects.bulk_create([DBPoint(location=Point(0.5, 0.5))])
+
+        call_command("rebuild_membership_index", stdout=StringIO())
+
+        self.assertEqual(
+            {point_id for point_id, _ in self.memberships()},
+            set(DBPoint.objects.filter(location__intersects=self.polygon.polygon).values_list("id", flat=True)),
+        )
+        self.assertEqual(len(self.memberships()), 2)
+
+    def test_intersection_endpoint(self):
+        url = reverse("polygon-intersection", args=[self.polygon.id])
+        response = self.client.post(url, {"points": [self.inside.id, self.outside.id]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([feature["id"] for feature in response.data["features"]], [self.inside.id])
+
+    @override_settings(GEO_API_MEMBERSHIP_INDEX=False)
+    def test_disabled(self):
+        DBPoint.objects.create(location=Point(0.5, 0.5))
+
+        self.assertEqual(self.memberships(), {(self.inside.id, self.polygon.id)})
+
+
+@override_settings(GEO_API_MEMBERSHIP_INDEX=True)
+class RebuildConcurrencyTests(TransactionTestCase):
+    def test_readers_see_old_rows_during_rebuild(self):
+        polygon = DBPolygon.objects.create(polygon=Polygon(((0, 0), (0, 2), (2, 2), (2, 0), (0, 0))))
+        point = DBPoint.objects.create(location=Point(1, 1))
+        reader = connections.create_connection(DEFAULT_DB_ALIAS)
+        seen = []
+
+        def read(last_polygon_id, total):
+            with reader.cursor() as cursor:
+                # Fails instead of waiting when the rebuild locks readers out
+                cursor.execute("SET lock_timeout = '1s'")
+                cursor.execute(f"SELECT point_id, polygon_id FROM {DBPointPolygonMembership._meta.db_table}")
+                seen.append(cursor.fetchall())
+
+        try:
+            membership.rebuild(progress=read)
+        finally:
+            reader.close()
+
+        self.assertEqual(seen, [[(point.id, polygon.id)]])
@@ -4,9 +4,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from geo_api.models import DBPolygon, DBPoint
+from geo_api.tests.utils import QueryPlanAssertionsMixin
 
 
-class PolygonIntersectionApiViewTests(APITestCase):
+class PolygonIntersectionApiViewTests(QueryPlanAssertionsMixin, APITestCase):
     def setUp(self):
         self.list_of_points_coords = [
             [0.0, 0.0],
@@ -28,7 +29,8 @@ class PolygonIntersectionApiViewTests(APITestCase):
         """
         Test should return status 405
         """
-        response = self.client.get(self.polygon_url)
+        with self.assertQueryPlan(0):
+            response = self.client.get(self.polygon_url)
 
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
@@ -38,7 +40,8 @@ class PolygonIntersectionApiViewTests(APITestCase):
         Expected response: list of Point objects in Geojson format
         """
         data = {"points": [self.point1.id, self.point2.id, self.point3.id]}
-        response = self.client.post(self.polygon_url, data, format="json")
+        with self.assertQueryPlan(2):
+            response = self.client.post(self.polygon_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)  # point1 and point3 should intersect
@@ -51,7 +54,8 @@ class PolygonIntersectionApiViewTests(APITestCase):
         """
         invalid_url = reverse("polygon-intersection", args=[self.polygon.id + 1])
         data = {"points": [self.point1.id, self.point2.id]}
-        response = self.client.post(invalid_url, data, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(invalid_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
@@ -60,17 +64,37 @@ class PolygonIntersectionApiViewTests(APITestCase):
         Test should return status 404
         """
         data = {"points": [self.polygon.id + 1]}
-        response = self.client.post(self.polygon_url, data, format="json")
+        with self.assertQueryPlan(2):
+            response = self.client.post(self.polygon_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data["error"], "No Points found for provided IDs")
 
+    def test_large_id_list(self):
+        """
+        Ids are bound as a single array, the number of queries doesn't depend on their count
+        """
+        data = {"points": [self.point3.id, *range(self.point3.id + 1, self.point3.id + 10_000), self.point1.id]}
+        with self.assertQueryPlan(2) as guard:
+            response = self.client.post(self.polygon_url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([point["id"] for point in response.data["features"]], [self.point1.id])
+        # The array is bound once as a single literal, not again by the lookup of the first found point
+        arrays = [param for param in guard.queries[-1].params if isinstance(param, str) and param.startswith("{")]
+        self.assertEqual([array.count(",") + 1 for array in arrays], [10_001])
+
+    def test_any_lookup_only_on_integer_fields(self):
+        self.assertIsNotNone(DBPoint._meta.get_field("id").get_lookup("any"))
+        self.assertIsNone(DBPoint._meta.get_field("geohash").get_lookup("any"))
+
     def test_empty_points_list(self):
         """
         Test should return status 400
         """
         data = {"points": []}
-        response = self.client.post(self.polygon_url, data, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(self.polygon_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data["error"], "No proper line ids have been provided!")
@@ -80,6 +104,7 @@ class PolygonIntersectionApiViewTests(APITestCase):
         Test should return status 400
         """
         data = {"invalid_key": [self.point1.id]}
-        response = self.client.post(self.polygon_url, data, format="json")
+        with self.assertQueryPlan(1):
+            response = self.client.post(self.polygon_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
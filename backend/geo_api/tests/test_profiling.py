@@ -0,0 +1,61 @@
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api.models import DBPoint
+from geo_api.profiling import RequestProfile, registry
+
+
+class ProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.clear()
+        DBPoint.objects.create(location=Point(12.4924, 41.8902))
+        self.list_url = reverse("point-list-create")
+
+    def test_server_timing_header(self):
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        server_timing = response["Server-Timing"]
+        for phase in ("db", "geometry", "serialize", "render", "total"):
+            self.assertIn(f"{phase};", server_timing)
+        self.assertIn('desc="1 queries"', server_timing)
+
+    @override_settings(GEO_API_SERVER_TIMING=False)
+    def test_server_timing_header_disabled(self):
+        response = self.client.get(self.list_url)
+
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(GEO_API_PROFILING=False)
+    def test_profiling_disabled(self):
+        response = self.client.get(self.list_url)
+
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertNotIn("geo_api_requests_total", registry.render())
+
+    def test_metrics(self):
+        self.client.get(self.list_url)
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = response.content.decode()
+        self.assertIn('geo_api_requests_total{view="point-list-create",method="GET",status="200"} 1', metrics)
+        self.assertIn('geo_api_db_queries_total{view="point-list-create",method="GET"} 1', metrics)
+        self.assertIn(
+            'geo_api_request_duration_seconds_bucket{view="point-list-create",method="GET",le="+Inf"} 1', metrics
+        )
+        self.assertIn("# TYPE geo_api_requests_total counter", metrics)
+        self.assertEqual(metrics.count("# TYPE geo_api_request_duration_seconds histogram"), 1)
+
+    def test_metrics_keep_precision(self):
+        profile = RequestProfile()
+        registry.observe("point-list-create", "GET", 200, 0.1234567, profile, 1234567)
+
+        metrics = registry.render()
+        self.assertIn('geo_api_response_bytes_total{view="point-list-create",method="GET"} 1234567\n', metrics)
+        self.assertIn(
+            'geo_api_request_duration_seconds_sum{view="point-list-create",method="GET"} 0.1234567\n', metrics
+        )
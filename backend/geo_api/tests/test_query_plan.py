@@ -0,0 +1,118 @@
+from django.contrib.gis.db.models.functions import Translate
+from django.contrib.gis.geos import Point, Polygon
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+
+from geo_api.models import DBPoint
+from geo_api.query_plan import QueryPlanGuard, QueryPlanViolation, sequential_spatial_scans
+
+
+class SequentialSpatialScansTests(SimpleTestCase):
+    def test_seq_scan_with_spatial_filter(self):
+        plan = {
+            "Node Type": "Seq Scan",
+            "Relation Name": "geo_api_dbpoint",
+            "Filter": "st_intersects(location, '0103'::geometry)",
+        }
+
+        self.assertEqual(list(sequential_spatial_scans(plan)), [plan])
+
+    def test_index_scan_with_spatial_filter(self):
+        plan = {
+            "Node Type": "Bitmap Heap Scan",
+            "Recheck Cond": "(location && '0103'::geometry)",
+            "Filter": "st_intersects(location, '0103'::geometry)",
+            "Plans": [{"Node Type": "Bitmap Index Scan", "Index Name": "geo_api_dbpoint_location_id"}],
+        }
+
+        self.assertEqual(list(sequential_spatial_scans(plan)), [])
+
+    def test_nested_loop_with_spatial_join_filter(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Join Filter": "st_intersects(p.location, g.polygon)",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "geo_api_dbpoint", "Index Name": "geo_api_dbpoint_pkey"},
+                {
+                    "Node Type": "Materialize",
+                    "Plans": [{"Node Type": "Seq Scan", "Relation Name": "geo_api_dbpolygon"}],
+                },
+            ],
+        }
+
+        self.assertEqual(list(sequential_spatial_scans(plan)), [plan])
+
+    def test_nested_loop_with_spatial_index_condition(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "geo_api_dbpoint", "Index Name": "geo_api_dbpoint_pkey"},
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "geo_api_dbpolygon",
+                    "Index Cond": "(polygon && p.location)",
+                    "Filter": "st_intersects(p.location, polygon)",
+                },
+            ],
+        }
+
+        self.assertEqual(list(sequential_spatial_scans(plan)), [])
+
+    def test_seq_scan_without_spatial_filter(self):
+        plan = {"Node Type": "Seq Scan", "Relation Name": "geo_api_dbpoint", "Filter": "(id > 1)"}
+
+        self.assertEqual(list(sequential_spatial_scans(plan)), [])
+
+
+class QueryPlanGuardTests(TestCase):
+    def setUp(self):
+        self.points = [DBPoint.objects.create(location=Point(x, x)) for x in range(3)]
+        self.polygon = Polygon(((0, 0), (0, 1.5), (1.5, 1.5), (1.5, 0), (0, 0)))
+
+    def test_indexed_spatial_query_passes(self):
+        with QueryPlanGuard(max_queries=1) as guard:
+            list(DBPoint.objects.filter(location__intersects=self.polygon))
+
+        guard.check()
+
+    def test_query_budget_exceeded(self):
+        with QueryPlanGuard(max_queries=1) as guard:
+            list(DBPoint.objects.all())
+            DBPoint.objects.count()
+
+        with self.assertRaisesMessage(QueryPlanViolation, "2 queries executed, budget is 1"):
+            guard.check()
+
+    def test_savepoints_not_counted(self):
+        with QueryPlanGuard(max_queries=1) as guard:
+            with transaction.atomic():
+                list(DBPoint.objects.all())
+
+        self.assertEqual([query.sql for query in guard.queries if "SAVEPOINT" in query.sql], [])
+        guard.check()
+
+    def test_executemany_counted_once(self):
+        with QueryPlanGuard(max_queries=1) as guard:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"UPDATE {DBPoint._meta.db_table} SET location = location WHERE id = %s",
+                    [[point.pk] for point in self.points],
+                )
+
+        self.assertEqual(len(guard.queries), 1)
+        guard.check()
+
+    def test_repeated_statement(self):
+        with QueryPlanGuard() as guard:
+            for point in self.points:
+                DBPoint.objects.get(pk=point.pk)
+
+        with self.assertRaisesMessage(QueryPlanViolation, "possible N+1 queries"):
+            guard.check()
+
+    def test_unindexed_spatial_predicate(self):
+        with QueryPlanGuard() as guard:
+            list(DBPoint.objects.annotate(moved=Translate("location", 0, 0)).filter(moved__intersects=self.polygon))
+
+        with self.assertRaisesMessage(QueryPlanViolation, "instead of the GiST index"):
+            guard.check()
@@ -0,0 +1,69 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from geo_api.api_views.geospatial_data import JoinLinesAPIView, PointListCreateAPIView
+from geo_api.models import DBPoint
+from geo_api.routers import PRIMARY_COOKIE, ReadReplicaMiddleware, ReadReplicaRouter
+
+router = ReadReplicaRouter()
+
+
+@override_settings(GEO_API_READ_REPLICAS=["replica_1"], GEO_API_REPLICA_STICKINESS=5)
+class ReadReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.routed_reads = []
+
+    def handle(self, request, view, write=False):
+        def get_response(request):
+            middleware.process_view(request, view.as_view(), (), {})
+            self.routed_reads.append(router.db_for_read(DBPoint))
+            if write:
+                router.db_for_write(DBPoint)
+                self.routed_reads.append(router.db_for_read(DBPoint))
+            return HttpResponse()
+
+        middleware = ReadReplicaMiddleware(get_response)
+        return middleware(request)
+
+    def test_get_reads_from_replica(self):
+        response = self.handle(self.factory.get("/"), PointListCreateAPIView)
+
+        self.assertEqual(self.routed_reads, ["replica_1"])
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_read_only_post_reads_from_replica(self):
+        self.handle(self.factory.post("/"), JoinLinesAPIView)
+
+        self.assertEqual(self.routed_reads, ["replica_1"])
+
+    def test_write_pins_client_to_primary(self):
+        response = self.handle(self.factory.post("/"), PointListCreateAPIView, write=True)
+
+        self.assertEqual(self.routed_reads, ["default", "default"])
+        self.assertEqual(response.cookies[PRIMARY_COOKIE]["max-age"], 5)
+
+    def test_reads_after_write_go_to_primary(self):
+        self.handle(self.factory.post("/"), JoinLinesAPIView, write=True)
+
+        self.assertEqual(self.routed_reads, ["replica_1", "default"])
+
+    def test_sticky_client_reads_from_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[PRIMARY_COOKIE] = "1"
+        self.handle(request, PointListCreateAPIView)
+
+        self.assertEqual(self.routed_reads, ["default"])
+
+    @override_settings(GEO_API_READ_REPLICAS=[])
+    def test_without_replicas(self):
+        response = self.handle(self.factory.get("/"), PointListCreateAPIView, write=True)
+
+        self.assertEqual(self.routed_reads, ["default", "default"])
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_outside_of_requests(self):
+        self.assertEqual(router.db_for_read(DBPoint), "default")
+        self.assertEqual(router.db_for_write(DBPoint), "default")
+        self.assertTrue(router.allow_migrate("default", "geo_api"))
+        self.assertFalse(router.allow_migrate("replica_1", "geo_api"))
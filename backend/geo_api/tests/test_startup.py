@@ -0,0 +1,42 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api.benchmarks.startup import import_time_by_package, parse_importtime
+from geo_api.warmup import warm_up
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django
+import time:        80 |         80 |   rest_framework.settings
+import time:      1500 |       1580 | rest_framework
+"""
+
+
+class ImportTimeTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        modules = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(list(modules), ["django.utils.version", "django", "rest_framework.settings", "rest_framework"])
+        self.assertEqual(modules["django"], {"self_us": 300, "cumulative_us": 420, "depth": 1})
+        self.assertEqual(modules["rest_framework"]["depth"], 0)
+
+    def test_import_time_by_package(self):
+        packages = import_time_by_package(parse_importtime(IMPORTTIME_OUTPUT))
+
+        self.assertEqual(packages, {"rest_framework": 1580, "django": 420})
+
+
+class WarmUpTests(SimpleTestCase):
+    def test_warm_up_without_database(self):
+        self.assertEqual(list(warm_up(connect=False)), ["imports", "geometry"])
+
+
+class LazySwaggerTests(APITestCase):
+    def test_schema(self):
+        response = self.client.get(reverse("schema-json", kwargs={"format": ".json"}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"/points/", response.content)
@@ -0,0 +1,168 @@
+from io import StringIO
+
+from django.contrib.gis.geos import Point, LineString
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from geo_api import geohash
+from geo_api.models import DBPoint, DBLineString
+from geo_api.tests.utils import QueryPlanAssertionsMixin
+
+
+class GeoHashTests(SimpleTestCase):
+    def test_encode(self):
+        self.assertEqual(geohash.encode(10.40744, 57.64911, precision=11), "u4pruydqqvj")
+        self.assertEqual(geohash.encode(-5.6, 42.6, precision=5), "ezs42")
+
+    def test_covering_prefixes(self):
+        prefixes = geohash.covering_prefixes((10.40, 57.64, 10.41, 57.65))
+
+        self.assertTrue(prefixes)
+        self.assertTrue(all(prefix.startswith("u4pru") for prefix in prefixes))
+        self.assertLessEqual(len(prefixes), 32)
+
+    def test_next_prefix(self):
+        self.assertEqual(geohash.next_prefix("u4"), "u5")
+        self.assertEqual(geohash.next_prefix("bz"), "c")
+        self.assertIsNone(geohash.next_prefix("zz"))
+
+    def test_in_range(self):
+        self.assertTrue(geohash.in_range(-180, -90, 180, 90))
+        self.assertFalse(geohash.in_range(-181, 0, 0, 0))
+        self.assertFalse(geohash.in_range(0, 0, 0, 91))
+        self.assertFalse(geohash.in_range(float("nan"), 0, 1, 1))
+
+    def test_covering_ranges_merge_adjacent_cells(self):
+        self.assertEqual(geohash.covering_ranges((-180, -90, 180, 90)), [("0", None)])
+        self.assertEqual(geohash.covering_ranges((10, 45, 25, 55)), [("u0", "u4"), ("u8", "ub")])
+
+
+class InBBoxFilterTests(QueryPlanAssertionsMixin, APITestCase):
+    def setUp(self):
+        self.rome = DBPoint.objects.create(location=Point(12.4924, 41.8902))
+        self.warsaw = DBPoint.objects.create(location=Point(21.017532, 52.237049))
+        self.line = DBLineString.objects.create(line=LineString((0, 0), (30, 60)))
+        self.points_url = reverse("point-list-create")
+        self.lines_url = reverse("linestring-list-create")
+
+    def test_points_in_bbox(self):
+        with self.assertQueryPlan(1):
+            response = self.client.get(self.points_url, {"in_bbox": "20,50,22,53"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([feature["id"] for feature in response.data["features"]], [self.warsaw.id])
+
+    def test_points_in_bbox_covering_whole_world(self):
+        response = self.client.get(self.points_url, {"in_bbox": "-180,-90,180,90"})
+
+        self.assertEqual(len(response.data["features"]), 2)
+
+    def test_lines_in_bbox(self):
+        # Only the middle of the line lies in the bbox
+        response = self.client.get(self.lines_url, {"in_bbox": "14,29,16,31"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([feature["id"] for feature in response.data["features"]], [self.line.id])
+
+    def test_invalid_bbox(self):
+        response = self.client.get(self.points_url, {"in_bbox": "20,50,22"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_finite_or_out_of_range_bbox(self):
+        for bbox in ("nan,0,1,1", "0,0,inf,1", "-inf,0,1,1", "0,0,190,1", "0,-91,1,1"):
+            with self.subTest(bbox=bbox):
+                response = self.client.get(self.points_url, {"in_bbox": bbox})
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SpatialOrderingFilterTests(APITestCase):
+    def setUp(self):
+        # Ids go back and forth between Europe and South America
+        coordinates = [(12.49, 41.89), (-58.38, -34.60), (21.01, 52.23), (-43.17, -22.90)]
+        self.points = [DBPoint.objects.create(location=Point(*coords)) for coords in coordinates]
+        self.points_url = reverse("point-list-create")
+
+    def test_default_order(self):
+        response = self.client.get(self.points_url)
+
+        self.assertEqual([feature["id"] for feature in response.data["features"]], [point.id for point in self.points])
+
+    def test_geohash_order(self):
+        response = self.client.get(self.points_url, {"order": "geohash"})
+
+        expected_order = [self.points[1], self.points[3], self.points[0], self.points[2]]
+        self.assertEqual(
+            [feature["id"] for feature in response.data["features"]], [point.id for point in expected_order]
+        )
+
+    def test_invalid_order(self):
+        response = self.client.get(self.points_url, {"order": "hilbert"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TunePointStorageCommandTests(TestCase):
+    def test_cluster_dry_run(self):
+        output = StringIO()
+        call_command("tune_point_storage", "cluster", "--order", "geohash", "--dry-run", stdout=output)
+
+        self.assertIn("CLUSTER geo_api_dbpoint USING geo_api_dbpoint_gh_order", output.getvalue())
+
+    def test_partition_dry_run(self):
+        output = StringIO()
+        call_command("tune_point_storage", "partition", "--dry-run", stdout=output)
+
+        statements = output.getvalue()
+        self.assertIn("PARTITION BY RANGE (geohash)", statements)
+        self.assertIn("PARTITION OF geo_api_dbpoint FOR VALUES FROM ('u') TO ('v')", statements)
+        self.assertIn("PRIMARY KEY (id, geohash)", statements)
+        self.assertEqual(DBPoint.objects.count(), 0)
+
+
+class PartitionedPointsTests(APITestCase):
+    def setUp(self):
+        self.rome = DBPoint.objects.create(location=Point(12.4924, 41.8902))
+        self.warsaw = DBPoint.objects.create(location=Point(21.017532, 52.237049))
+        self.points_url = reverse("point-list-create")
+        call_command("tune_point_storage", "partition", stdout=StringIO())
+
+    def test_table_partitioned(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_inherits WHERE inhparent = 'geo_api_dbpoint'::regclass")
+            self.assertEqual(cursor.fetchone()[0], 32)
+            constraints = connection.introspection.get_constraints(cursor, DBPoint._meta.db_table)
+
+        self.assertEqual(constraints["geo_api_dbpoint_pkey"]["columns"], ["id", "geohash"])
+        self.assertIn("geo_api_dbpoint_gh_order", constraints)
+        self.assertTrue(any(name.startswith("geo_api_dbpoint_location_") for name in constraints))
+
+    def test_point_endpoints(self):
+        response = self.client.post(self.points_url, {"type": "Point", "coordinates": [-58.38, -34.60]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = DBPoint.objects.get(pk=response.data["id"])
+        self.assertGreater(created.pk, self.warsaw.pk)
+        self.assertEqual(created.geohash, geohash.encode(-58.38, -34.60))
+
+        response = self.client.get(self.points_url)
+        self.assertEqual(
+            [feature["id"] for feature in response.data["features"]], [self.rome.id, self.warsaw.id, created.id]
+        )
+
+        # Moving a point moves its row into another partition
+        response = self.client.put(
+            reverse("point-detail", args=[self.rome.id]), {"type": "Point", "coordinates": [21.0, 52.2]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.points_url, {"in_bbox": "20,50,22,53"})
+        self.assertEqual([feature["id"] for feature in response.data["features"]], [self.rome.id, self.warsaw.id])
+
+    def test_duplicate_id_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DBPoint.objects.bulk_create([DBPoint(id=self.rome.id, location=self.rome.location)])
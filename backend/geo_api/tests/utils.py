@@ -0,0 +1,18 @@
+from contextlib import contextmanager
+
+from geo_api.query_plan import QueryPlanGuard
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Test case mixin checking the statements executed by a block against a query budget and their plans.
+    See `geo_api.query_plan.QueryPlanGuard`.
+    """
+
+    @contextmanager
+    def assertQueryPlan(self, max_queries, max_repeats=1):
+        with QueryPlanGuard(max_queries=max_queries, max_repeats=max_repeats) as guard:
+            yield guard
+        problems = guard.violations()
+        if problems:
+            self.fail("\n".join(problems))
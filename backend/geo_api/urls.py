@@ -10,6 +10,7 @@ from geo_api.api_views.geospatial_data import (
     PolygonIntersectionApiView,
     JoinLinesAPIView,
 )
+from geo_api.api_views.jobs import JobRetrieveAPIView, JobResultAPIView
 
 urlpatterns = [
     path("points/", PointListCreateAPIView.as_view(), name="point-list-create"),
@@ -20,4 +21,6 @@ urlpatterns = [
     path("polygon/<int:pk>/", PolygonRetrieveUpdateDestroyAPIView.as_view(), name="polygon-detail"),
     path("polygon/<int:pk>/intersection", PolygonIntersectionApiView.as_view(), name="polygon-intersection"),
     path("join_lines/", JoinLinesAPIView.as_view(), name="join-lines"),
+    path("jobs/<uuid:pk>/", JobRetrieveAPIView.as_view(), name="job-detail"),
+    path("jobs/<uuid:pk>/result", JobResultAPIView.as_view(), name="job-result"),
 ]
@@ -0,0 +1,52 @@
+"""
+Work done once before a worker accepts traffic, so the first requests don't pay for it.
+
+    - imports: the URL configuration and with it views, serializers and DRF are imported lazily by Django,
+    - GEOS/GDAL: the libraries are loaded with ctypes on first use, PROJ reads its database on the first transform,
+    - database: a connection to the primary and every replica is opened, kept with persistent connections
+      (CONN_MAX_AGE). Connections mustn't be shared by forked processes, so open them after forking.
+"""
+
+import logging
+import time
+
+from django.contrib.gis.gdal import CoordTransform, SpatialReference
+from django.contrib.gis.geos import Point
+from django.db import connections
+from django.urls import get_resolver
+
+from geo_api.models import DEFAULT_SRID
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_imports():
+    get_resolver().url_patterns
+
+
+def warm_up_geometry():
+    point = Point(12.4924, 41.8902, srid=DEFAULT_SRID)
+    point.buffer(1).intersects(point)
+    point.transform(CoordTransform(SpatialReference(DEFAULT_SRID), SpatialReference(3857)))
+
+
+def warm_up_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def warm_up(connect=True):
+    """
+    Run every warm-up step and return the seconds each of them took.
+    """
+    steps = {"imports": warm_up_imports, "geometry": warm_up_geometry}
+    if connect:
+        steps["connections"] = warm_up_connections
+    timings = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    summary = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in timings.items())
+    logger.info("Warm-up finished: %s", summary)
+    return timings
@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration of the production boot mode, see entrypoint.sh.
+"""
+
+import os
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+# Modules are imported and GEOS/GDAL warmed up once in the master, workers share them copy-on-write
+preload_app = True
+
+
+def post_fork(server, worker):
+    from geo_api.warmup import warm_up_connections
+
+    warm_up_connections()
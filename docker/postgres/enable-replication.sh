@@ -0,0 +1,4 @@
+#!/bin/sh
+# Executed by the primary on initialization of its data directory, lets the replica stream WAL from it
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
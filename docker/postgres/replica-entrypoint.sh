@@ -0,0 +1,14 @@
+#!/bin/sh
+# Clones the primary into an empty data directory and starts it as a hot standby streaming from the primary
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_isready -h "$PRIMARY_HOST" -U "$POSTGRES_USER"; do
+        sleep 1
+    done
+    mkdir -p "$PGDATA"
+    chown postgres:postgres "$PGDATA"
+    chmod 700 "$PGDATA"
+    PGPASSWORD="$POSTGRES_PASSWORD" su-exec postgres \
+        pg_basebackup -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -D "$PGDATA" --write-recovery-conf --wal-method=stream
+fi
+exec docker-entrypoint.sh postgres